@@ -1,10 +1,10 @@
 # Simulation logic & density functions
 import math
-import time
 import random
 from . import settings
 from .vehicle import Vehicle
 from .traffic_signal import TrafficSignal
+from .arrivals import schedule_for_run, replay_schedule
 from .yolo_intergation import get_lane_density, get_lane_queue
 
 # Initialize all traffic light signal objects
@@ -149,7 +149,6 @@ def signal_controller():
                       "s, ending green early")
                 break
 
-            settings.time_elapsed += 1
             settings.signals[settings.current_green].signal_text = settings.signals[settings.current_green].green
             settings.signals[settings.current_green].green -= 1
             settings.signals[settings.current_green].total_green_time += 1
@@ -159,24 +158,23 @@ def signal_controller():
                 if i != settings.current_green:
                     settings.signals[i].signal_text = "---"
 
-            time.sleep(1)
+            yield 1
 
         settings.signals[settings.current_green].green = 0
 
         # Yellow light phase
         settings.current_yellow = 1
         while settings.signals[settings.current_green].yellow > 0:
-            settings.time_elapsed += 1
             settings.signals[settings.current_green].signal_text = settings.signals[settings.current_green].yellow
             settings.signals[settings.current_green].yellow -= 1
-            time.sleep(1)
+            yield 1
 
         settings.current_yellow = 0
         settings.signals[settings.current_green].signal_text = "stop"
 
         # Mark when the current lane finished its green + yellow
         finished_lane = settings.current_green
-        settings.lane_last_green_end[finished_lane] = settings.time_elapsed
+        settings.lane_last_green_end[finished_lane] = settings.sim_clock.now
 
         # Next lane choice (with ambulance priority)
         amb_dir = find_ambulance_dir()
@@ -191,7 +189,7 @@ def signal_controller():
         # Time taken for next lane to turn green light
         last_end = settings.lane_last_green_end[next_green]
         if last_end > 0:
-            wait_before_green = settings.time_elapsed - last_end
+            wait_before_green = settings.sim_clock.now - last_end
             settings.lane_wait_before_green_sum[next_green] += wait_before_green
             settings.lane_wait_before_green_count[next_green] += 1
 
@@ -204,12 +202,17 @@ def signal_controller():
 # Generate vehicles while simulation runs
 def generate_vehicles():
 
+    # Replay a seeded arrival schedule instead of live random spawns
+    if settings.arrival_seed is not None:
+        yield from replay_schedule(schedule_for_run(), Vehicle)
+        return
+
     while settings.simulation_running:
 
         if not settings.simulation_running:
             return
 
-        now = time.time()
+        now = settings.sim_clock.now
 
         # Ambulance spawn chance
         time_since_last_amb = now - settings.last_ambulance_spawn_time
@@ -263,4 +266,16 @@ def generate_vehicles():
             if not settings.simulation_running:
                 return
         
-        time.sleep(0.50) # Delay for every vehicle spawn
\ No newline at end of file
+        yield settings.spawn_interval # Delay for every vehicle spawn
+
+# Start controller & spawner tasks on the simulated clock
+def start_simulation_tasks():
+
+    settings.sim_clock.schedule(signal_controller())
+    settings.sim_clock.schedule(generate_vehicles())
+
+# Advance the simulated clock by whole ticks (runs any due controller/spawner steps)
+def advance_clock(ticks=1):
+
+    settings.sim_clock.advance(ticks)
+    settings.time_elapsed = settings.sim_clock.now
\ No newline at end of file
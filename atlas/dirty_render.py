@@ -0,0 +1,48 @@
+# Dirty-rectangle rendering: only areas drawn this frame or last frame are repainted & sent to the display
+import pygame
+
+class DirtyRenderer:
+
+    def __init__(self, screen, background):
+        self.screen = screen
+        self.background = background.convert() # Static scenery (street & baked-in text)
+        self.rects = [] # Areas drawn this frame
+        self.prev_rects = [] # Areas drawn last frame (stale until the scenery is restored)
+        self.restore_all = True # Next restore repaints the whole scenery (first frame, after overlays)
+        self.update_all = True # This frame sends the whole screen to the display
+
+    # Draw something that never changes into the static scenery
+    def bake(self, surface, pos):
+        self.background.blit(surface, pos)
+        self.restore_all = True
+
+    # Start a frame: put the scenery back under last frame's drawings
+    def restore(self):
+        if self.restore_all:
+            self.screen.blit(self.background, (0, 0))
+            self.update_all = True
+            self.restore_all = False
+        else:
+            for rect in self.prev_rects:
+                self.screen.blit(self.background, rect, rect)
+
+    # Record an area drawn this frame (blit & draw calls return it)
+    def mark(self, rect):
+        self.rects.append(rect)
+        return rect
+
+    # The whole screen is drawn over this frame (end-of-run overlay, fade-out)
+    def mark_all(self):
+        self.update_all = True
+        self.restore_all = True
+
+    # Send this frame's changes to the display (last frame's areas too, to erase what moved away)
+    def update(self):
+        if self.update_all:
+            pygame.display.update()
+        else:
+            pygame.display.update(self.prev_rects + self.rects)
+
+        self.prev_rects = self.rects
+        self.rects = []
+        self.update_all = False
\ No newline at end of file
@@ -1,6 +1,7 @@
 # Global constants & parameters
 import os
 import pygame
+from .sim_clock import SimClock
 
 # Base path of the atlas folder
 base_path = os.path.dirname(__file__)
@@ -49,6 +50,13 @@ base_time_per_weight = 1.5
 # Stop simulation when more than [amount of vehicles] have crossed
 vehicle_limit = 250
 
+# Seconds between vehicle spawns
+spawn_interval = 0.5
+
+# Replay a pre-sampled arrival schedule with this seed (None = live random spawns)
+arrival_seed = None
+poisson_arrivals = False # scheduled arrival times follow a Poisson process instead of a fixed interval
+
 # Ambulance spawn control
 last_ambulance_spawn_time = 0.0
 ambulance_cooldown = 60.0
@@ -100,6 +108,30 @@ x = {d: coords[:] for d, coords in base_x.items()}
 y = {d: coords[:] for d, coords in base_y.items()}
 stops = {d: coords[:] for d, coords in base_stops.items()}
 
+# Map size; vehicles that have crossed & driven past it are retired
+screen_width = 1400
+screen_height = 800
+
+# YOLO backend: "torch" (pygame_model.pt), "onnx" or "onnx-int8" (ONNX Runtime, for CPU-only machines)
+yolo_backend = "torch"
+yolo_device = None # "cuda", "cpu" or None (CUDA when available for torch, CPU for ONNX)
+
+# YOLO detection: run the four approach strips as one batch instead of the whole screen
+yolo_roi_crops = False
+yolo_imgsz = None # detector input size in px (None keeps the model default)
+
+# Load & warm up the YOLO model in the background once the ATLAS button is hovered in the main menu
+# (off by default: it imports torch, which only ATLAS runs need)
+yolo_preload = False
+
+# YOLO motion gating: skip inference while nothing moves in the approach strips
+yolo_motion_gating = True
+yolo_max_staleness = 1.0 # simulated seconds before a strip is re-detected anyway
+
+# YOLO tracking: detect on every Nth update only & carry tracked boxes forward every frame in between
+yolo_tracking = False
+yolo_detect_every = 2
+
 # Intersection centre used for turns
 mid = {
     "right": {"x": 705, "y": 445},
@@ -131,6 +163,14 @@ current_green = 0 # which lane is green light currently
 current_yellow = 0 # 0 = green/red, 1 = yellow
 time_elapsed = 0 # simulator start timer
 sim_time = 300 # maximum simulation duration
+sim_tick_rate = 120 # simulated clock ticks per second (one tick per movement step)
+render_fps = 120 # display frame cap (the simulation keeps sim_tick_rate ticks per wall second while frames stay under max_frame_time)
+
+# Wall seconds one rendered frame may simulate at most (stops a slow machine spiralling into ever longer frames).
+# Anything a slower frame took beyond it is dropped, not simulated: below 1 / max_frame_time FPS (4 at 0.25 s),
+# or on a single stall such as a window drag, simulated time falls behind wall time. Runs match simulated-time
+# progress across frame rates only while every frame stays under this limit.
+max_frame_time = 0.25
 
 # Reset simulation function
 def reset_for_new_run():
@@ -141,7 +181,7 @@ def reset_for_new_run():
     global queue_at_green_sum, queue_at_green_count
     global vehicles, x, y, stops
     global current_green, current_yellow, time_elapsed, simulation_running
-    global simulation
+    global simulation, sim_clock
     global last_ambulance_spawn_time
     global ambulance_priority_total, ambulance_priority_per_lane
 
@@ -179,11 +219,14 @@ def reset_for_new_run():
     current_yellow = 0
     time_elapsed = 0
 
-    # Controls background threads and timers
+    # Controls controller & spawner tasks
     simulation_running = True
 
-    # Reset ambulance timing
-    last_ambulance_spawn_time = 0.0
+    # Fresh simulated clock; controller, spawner & vehicle timing all read from it
+    sim_clock = SimClock(tick_rate=sim_tick_rate)
+
+    # Reset ambulance timing (first ambulance may spawn straight away)
+    last_ambulance_spawn_time = -ambulance_cooldown
 
     # PyGame sprite group for vehicles
     simulation = pygame.sprite.Group()
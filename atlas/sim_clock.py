@@ -0,0 +1,46 @@
+# Simulated clock that drives controller & spawner tasks without wall-clock sleeps
+import heapq
+
+class SimClock:
+
+    def __init__(self, tick_rate=60):
+        self.tick_rate = tick_rate # Ticks per simulated second (one tick = one movement frame)
+        self.ticks = 0 # Ticks elapsed since the start of the run
+        self._tasks = [] # Heap of (wake tick, order, generator)
+        self._order = 0 # Tie-breaker so tasks due on the same tick run in schedule order
+
+    # Current simulated time in seconds
+    @property
+    def now(self):
+        return self.ticks / self.tick_rate
+
+    # Length of one tick in seconds
+    @property
+    def tick_seconds(self):
+        return 1.0 / self.tick_rate
+
+    # Convert a delay in seconds to whole ticks (at least one tick)
+    def to_ticks(self, seconds):
+        return max(1, int(round(seconds * self.tick_rate)))
+
+    # Register a generator task; it runs until its first yield straight away
+    def schedule(self, task, delay=0):
+        heapq.heappush(self._tasks, (self.ticks + int(round(delay * self.tick_rate)), self._order, task))
+        self._order += 1
+        self._run_due()
+
+    # Move the clock forward and run every task that has become due
+    def advance(self, ticks=1):
+        for _ in range(ticks):
+            self.ticks += 1
+            self._run_due()
+
+    # Resume tasks whose wake tick has been reached
+    def _run_due(self):
+        while self._tasks and self._tasks[0][0] <= self.ticks:
+            _, order, task = heapq.heappop(self._tasks)
+            try:
+                delay = next(task)
+            except StopIteration:
+                continue
+            heapq.heappush(self._tasks, (self.ticks + self.to_ticks(delay), order, task))
\ No newline at end of file
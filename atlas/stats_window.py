@@ -3,6 +3,7 @@ import tkinter as tk
 from . import settings
 from .export_stats import sec_to_min_sec
 from .controller import compute_density, count_near_stop
+from .yolo_intergation import get_lane_wait
 
 # Global variables
 root = None
@@ -95,6 +96,10 @@ def start_stats_window():
             # Build label text using old-style formatting
             line_text = (dir_names[i] + ": dens=" + "%.2f" % score + " | queue=" + str(count) + " | passed=" + str(passed))
 
+            # Tracked vehicles' mean stopped time
+            if settings.yolo_tracking:
+                line_text += " | wait=" + "%.1f" % get_lane_wait(i) + "s"
+
             # Update lane label
             try:
                 lane_labels[i].config(text=line_text)
@@ -0,0 +1,77 @@
+# Export pygame_model.pt to ONNX (optionally int8-quantized) for CPU inference with ONNX Runtime
+import os
+import argparse
+from . import settings
+
+# Model file used by each YOLO backend
+def model_path_for(backend: str) -> str:
+
+    model_dir = os.path.join(settings.base_path, "assets", "YOLO model")
+    names = {
+        "torch": "pygame_model.pt",
+        "onnx": "pygame_model.onnx",
+        "onnx-int8": "pygame_model.int8.onnx",
+    }
+    return os.path.join(model_dir, names[backend])
+
+# PyTorch weights -> ONNX (dynamic batch & image size so ROI strip batches work too)
+def export_onnx(pt_path: str | None = None) -> str:
+
+    from ultralytics import YOLO
+
+    if pt_path is None:
+        pt_path = model_path_for("torch")
+
+    onnx_path = YOLO(pt_path).export(format="onnx", dynamic=True, simplify=True)
+    print("[YOLO] Exported ONNX model to:", onnx_path)
+    return onnx_path
+
+# ONNX -> int8 weights (dynamic quantization, no calibration data needed)
+def quantize_int8(onnx_path: str | None = None, int8_path: str | None = None) -> str:
+
+    import onnx
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    if onnx_path is None:
+        onnx_path = model_path_for("onnx")
+    if int8_path is None:
+        int8_path = model_path_for("onnx-int8")
+
+    quantize_dynamic(onnx_path, int8_path, weight_type=QuantType.QUInt8)
+
+    # Keep the ultralytics metadata (class names, stride, imgsz) on the quantized model
+    source = onnx.load(onnx_path)
+    quantized = onnx.load(int8_path)
+    del quantized.metadata_props[:]
+    quantized.metadata_props.extend(source.metadata_props)
+    onnx.save(quantized, int8_path)
+
+    print("[YOLO] Quantized int8 model to:", int8_path)
+    return int8_path
+
+# Model file for a backend, exported/quantized on first use
+def ensure_model(backend: str) -> str:
+
+    path = model_path_for(backend)
+    if os.path.exists(path):
+        return path
+
+    if backend == "onnx":
+        return export_onnx()
+
+    if backend == "onnx-int8":
+        if not os.path.exists(model_path_for("onnx")):
+            export_onnx()
+        return quantize_int8()
+
+    return path
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Export the ATLAS YOLO model to ONNX for CPU inference")
+    parser.add_argument("--int8", action="store_true", help="also write an int8-quantized model")
+    args = parser.parse_args()
+
+    export_onnx()
+    if args.int8:
+        quantize_int8()
\ No newline at end of file
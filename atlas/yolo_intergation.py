@@ -1,21 +1,52 @@
 # YOLO intergration settings for ATLAS simulator
 import os
-import torch
+import time
 import pygame
 import threading
+import collections
 import numpy as np
-from ultralytics import YOLO
 import pygame.surfarray as surfarray
 from . import settings
+from .yolo_export import ensure_model
+from .yolo_tracker import BoxTracker
 
 # Global YOLO state
 _model = None
 _model_lock = threading.Lock()
+_model_backend = None
+_predict_kwargs = {} # extra predict arguments (device for ONNX backends)
+_warmed_up = False # first (one-off cost) inference already done
+_preload_thread = None
+
+# Per-inference latency (ms) of the most recent forward passes
+_latency_ms = collections.deque(maxlen=500)
+
+# Background inference worker (single-slot mailbox: a newer frame replaces one still waiting)
+_mailbox = None
+_mailbox_cond = threading.Condition()
+_worker = None
+_worker_stop = None # set to ask the current worker to exit
+_stopped_worker = None # previous run's worker, possibly still finishing a forward pass
+worker_join_timeout = 10.0 # seconds a new run waits for that pass at most
+_frames_dropped = 0 # frames replaced before the worker picked them up
+_mailbox_dirs = None # strips to re-detect for the mailbox frame (None: all)
+_mailbox_time = 0.0 # simulated time the mailbox frame was captured
+_frame_in_flight = False # a submitted frame is waiting or being detected (not yet folded into the tracker)
+
+# Preallocated contiguous BGR frames (H, W, 3) reused for every capture
+# (at most three in use: one being detected, one in the mailbox, one being captured)
+_free_frames = []
 
 # One entry per signal direction index
 # 0: right, 1: down, 2: left, 3: up
 _lane_density = [0.0] * settings.no_of_signals
 _lane_queue = [0] * settings.no_of_signals
+_lane_wait = [0.0] * settings.no_of_signals # mean stopped time of tracked vehicles (tracking only)
+
+# Tracker carrying boxes forward between detector runs
+_tracker = BoxTracker()
+_tracker_lock = threading.Lock()
+_yolo_updates = 0 # YOLO updates this run (detection runs on every yolo_detect_every-th one when tracking)
 
 # Map YOLO class IDs -> class names used
 yolo_class_id_to_name = {
@@ -28,6 +59,15 @@ yolo_class_id_to_name = {
 }
 vehicle_classes = set(settings.density_weights.keys())
 
+# Class-id-indexed density weights & vehicle mask for vectorized post-processing
+# (read from settings.density_weights on every call, so changes to it apply straight away)
+def _class_tables() -> tuple[np.ndarray, np.ndarray]:
+
+    names = [yolo_class_id_to_name[i] for i in range(len(yolo_class_id_to_name))]
+    weights = np.array([settings.density_weights.get(name, 1.0) for name in names])
+    is_vehicle = np.array([name in settings.density_weights for name in names])
+    return weights, is_vehicle
+
 # Lane band helpers
 _lane_bands = {}
 
@@ -47,135 +87,660 @@ _left_y_max = max(settings.y["left"]) + 40
 _up_x_min = min(settings.x["up"]) - 40
 _up_x_max = max(settings.x["up"]) + 40
 
-# Initialize YOLO model
-def init_yolo(model_path: str | None = None, device: str | None = None):
+# ROI depths (in pixels)
+roi_depth_density = 1000 # for density
+roi_depth_queue = 500 # for queue near stop-line
+
+# Approach strips for ROI-cropped detection: (dir_index, x0, y0, x1, y1) in screen pixels
+def _approach_strips(pad: int = 40) -> list:
 
-    global _model
+    stop = settings.stop_lines
+    strips = [
+        (0, stop["right"] - roi_depth_density, _right_y_min, stop["right"] + 10, _right_y_max),
+        (1, _down_x_min, stop["down"] - roi_depth_density, _down_x_max, stop["down"] + 10),
+        (2, stop["left"] - 10, _left_y_min, stop["left"] + roi_depth_density, _left_y_max),
+        (3, _up_x_min, stop["up"] - 10, _up_x_max, stop["up"] + roi_depth_density),
+    ]
+
+    # Pad so vehicles on a strip edge are seen whole, then clip to the screen
+    clipped = []
+    for dir_index, x0, y0, x1, y1 in strips:
+        clipped.append((
+            dir_index,
+            int(max(0, x0 - pad)),
+            int(max(0, y0 - pad)),
+            int(min(settings.screen_width, x1 + pad)),
+            int(min(settings.screen_height, y1 + pad)),
+        ))
+    return clipped
+
+_roi_strips = _approach_strips()
+
+# Motion gating: compare a sparse sample of each approach (unpadded, so traffic crossing
+# the junction past the stop line doesn't count) with the one at its last detection
+motion_sample_step = 4 # px between samples
+motion_pixel_threshold = 30 # summed RGB change for a sample to count as moved
+hud_text_size = (70, 30) # signal timer & passed counter text drawn over the strips (not motion)
+
+_motion_regions = _approach_strips(pad=0)
+
+# Per-region sample masks with the HUD text cut out
+def _motion_masks() -> list:
+
+    step = motion_sample_step
+    masks = []
+    for _, x0, y0, x1, y1 in _motion_regions:
+        mask = np.ones((len(range(x0, x1, step)), len(range(y0, y1, step))), dtype=bool)
+
+        for tx, ty in settings.signal_timer_coords + settings.vehicle_count_coords:
+            tw, th = hud_text_size
+            mask[
+                max(0, -(-(tx - x0) // step)):max(0, -(-(tx + tw - x0) // step)),
+                max(0, -(-(ty - y0) // step)):max(0, -(-(ty + th - y0) // step)),
+            ] = False
+        masks.append(mask)
+    return masks
+
+_strip_masks = _motion_masks()
+
+# Motion gate state (main thread) & per-strip results reused for unchanged strips (worker)
+_motion_refs = [None] * settings.no_of_signals
+_strip_refreshed_at = [float("-inf")] * settings.no_of_signals
+_strip_results = {}
+_frames_skipped = 0 # captures skipped because nothing moved
+
+# Initialize YOLO model ("torch", "onnx" or "onnx-int8" backend)
+def init_yolo(model_path: str | None = None, device: str | None = None, backend: str | None = None):
+
+    global _model, _model_backend, _predict_kwargs
 
     with _model_lock:
         if _model is not None:
             return
 
-        # Path to YOLO model
+        # Vision stack is only loaded once ATLAS actually starts (several seconds & hundreds of MB)
+        import torch
+        from ultralytics import YOLO
+
+        if backend is None:
+            backend = settings.yolo_backend
+
+        # Path to YOLO model (ONNX files are exported from pygame_model.pt on first use)
         if model_path is None:
-            model_path = os.path.join(settings.base_path, "assets", "YOLO model", "pygame_model.pt")
+            model_path = ensure_model(backend)
 
-        _model = YOLO(model_path)
-        
-        if device is None:
-            device = "cuda" if torch.cuda.is_available() else "cpu"
-        _model.to(device)
+        if backend == "torch":
+            _model = YOLO(model_path)
 
-        print("[YOLO] Loaded model from:", model_path, "on device:", device)
+            if device is None:
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+            _model.to(device)
+            _predict_kwargs = {}
+        else:
+            # ONNX Runtime; device is passed per call (exported models can't be moved)
+            _model = YOLO(model_path, task="detect")
 
-# Run YOLO on Pygame
-def update_yolo_from_surface(surface: pygame.Surface):
+            if device is None:
+                device = "cpu"
+            _predict_kwargs = {"device": device}
 
-    global _lane_density, _lane_queue
+        _model_backend = backend
+        _latency_ms.clear()
 
-    if _model is None:
+        print("[YOLO] Loaded " + backend + " model from:", model_path, "on device:", device)
+
+# One inference on a blank frame of the simulator's size, so graph & allocator
+# warm-up is paid before the run instead of on its first detections
+def warm_up_yolo():
+
+    global _warmed_up
+
+    if _model is None or _warmed_up:
         return
 
-    # Convert Pygame surface -> numpy array (H, W, 3)
-    frame = surfarray.array3d(surface)
-    frame = np.transpose(frame, (1, 0, 2)) # (H, W, 3)
-    frame_bgr = frame[..., ::-1]
+    start = time.perf_counter()
+    frame = np.zeros((settings.screen_height, settings.screen_width, 3), dtype=np.uint8)
+    _detect_boxes(frame) # same input size & ROI batch as the run
 
-    # Run YOLO
-    results = _model(frame_bgr, verbose=False)[0]
+    with _model_lock:
+        _latency_ms.clear() # keep the one-off cost out of the latency stats
+        _warmed_up = True
 
-    dens = [0.0] * settings.no_of_signals
-    q = [0] * settings.no_of_signals
+    print("[YOLO] Warm-up inference took {:.0f} ms".format((time.perf_counter() - start) * 1000.0))
 
-    # ROI depths (in pixels)
-    roi_depth_density = 1000 # for density
-    roi_depth_queue = 500 # for queue near stop-line
+# Load & warm up the model on a background thread (e.g. while the main menu is idle)
+def preload_yolo():
 
-    stop = settings.stop_lines
+    global _preload_thread
+
+    if _model is not None or _preload_thread is not None:
+        return
+
+    def preload():
+        try:
+            init_yolo(device=settings.yolo_device)
+            warm_up_yolo()
+        except Exception as e:
+            print("[YOLO] Preload failed:", e) # ATLAS loads the model itself when it starts
+
+    # Daemon so quitting from the menu never waits on it
+    _preload_thread = threading.Thread(target=preload, name="yolo-preload", daemon=True)
+    _preload_thread.start()
+
+# Ready model for a run: waits for a preload in progress, otherwise loads & warms up here
+def ensure_yolo_ready():
+
+    global _preload_thread
+
+    if _preload_thread is not None:
+        _preload_thread.join()
+        _preload_thread = None
+
+    init_yolo(device=settings.yolo_device)
+    warm_up_yolo()
+
+# Drop the loaded model so init_yolo can load another backend/model
+def release_yolo():
+
+    global _model, _model_backend, _predict_kwargs, _warmed_up
+
+    stop_yolo_worker()
+
+    with _model_lock:
+        _model = None
+        _model_backend = None
+        _predict_kwargs = {}
+        _warmed_up = False
+
+# Latency summary of recent forward passes (ms) to compare backends
+def get_inference_latency() -> dict:
 
-    if results.boxes is None:
-        with _model_lock:
-            _lane_density = dens
-            _lane_queue = q
+    with _model_lock:
+        recent = list(_latency_ms)
+
+    if not recent:
+        return {"backend": _model_backend, "count": 0, "skipped": _frames_skipped}
+
+    samples = sorted(recent)
+    return {
+        "backend": _model_backend,
+        "count": len(samples),
+        "skipped": _frames_skipped,
+        "last_ms": recent[-1],
+        "mean_ms": sum(samples) / len(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(0.95 * len(samples)))],
+    }
+
+# Print the latency summary (once per run)
+def report_inference_latency():
+
+    stats = get_inference_latency()
+    if stats["count"] == 0:
         return
 
-    # Bounding boxes
-    boxes = results.boxes.xyxy.cpu().numpy() # (N, 4)
-    cls_ids = results.boxes.cls.cpu().numpy().astype(int) # (N,)
+    print(
+        "[YOLO] " + str(stats["backend"]) + " latency over " + str(stats["count"]) + " inferences:"
+        + " mean = " + ("%.1f" % stats["mean_ms"]) + " ms"
+        + " p95 = " + ("%.1f" % stats["p95_ms"]) + " ms"
+        + " last = " + ("%.1f" % stats["last_ms"]) + " ms"
+        + " (" + str(stats["skipped"]) + " unchanged frames skipped)"
+    )
+
+# Reuse a free frame buffer of the right size (allocates only on first use or resize)
+def _take_frame(shape: tuple) -> np.ndarray:
+
+    with _mailbox_cond:
+        while _free_frames:
+            frame = _free_frames.pop()
+            if frame.shape == shape:
+                return frame
+    return np.empty(shape, dtype=np.uint8)
+
+# Give a frame buffer back once nothing reads it any more
+def _release_frame(frame: np.ndarray):
+
+    with _mailbox_cond:
+        if len(_free_frames) < 3:
+            _free_frames.append(frame)
+
+# Copy Pygame surface -> preallocated contiguous BGR frame (H, W, 3) in a single pass
+def _surface_to_bgr(surface: pygame.Surface) -> np.ndarray:
+
+    width, height = surface.get_size()
+    frame = _take_frame((height, width, 3))
+
+    # Read the pixels in place through the buffer interface (falls back to a copy for 8/16-bit surfaces)
+    try:
+        pixels = surfarray.pixels3d(surface) # (W, H, 3), RGB
+    except ValueError:
+        pixels = surfarray.array3d(surface)
 
-    for box, cls_id in zip(boxes, cls_ids):
-        x1, y1, x2, y2 = box
+    np.copyto(frame, pixels.transpose(1, 0, 2)[..., ::-1]) # transpose & RGB -> BGR while copying
+    del pixels # unlock the surface
 
-        class_name = yolo_class_id_to_name.get(cls_id)
-        if class_name is None or class_name not in vehicle_classes:
-            continue
+    return frame
 
-        weight = settings.density_weights.get(class_name, 1.0)
+# Sparse per-strip samples (summed RGB) of the current view
+def _strip_signatures(surface: pygame.Surface) -> list:
 
-        cx = 0.5 * (x1 +x2)
-        cy = 0.5 * (y1 +y2)
+    try:
+        pixels = surfarray.pixels3d(surface) # (W, H, 3)
+    except ValueError:
+        pixels = surfarray.array3d(surface)
 
-        right_edge = x2
-        left_edge = x1
-        bottom_edge = y2
-        top_edge = y1
+    step = motion_sample_step
+    signatures = []
+    for (_, x0, y0, x1, y1), mask in zip(_motion_regions, _strip_masks):
+        signature = pixels[x0:x1:step, y0:y1:step].sum(axis=2, dtype=np.int16)
+        signature[~mask] = 0
+        signatures.append(signature)
+    del pixels # unlock the surface
 
-        dir_index = None
+    return signatures
 
-        # Direction 0 (right, moving East)
+# Direction strips that need a new detection: something moved in them, or their result is too old
+# (empty set: the last results are still current & inference can be skipped)
+def _strips_to_refresh(surface: pygame.Surface) -> set:
+
+    now = settings.sim_clock.now
+    signatures = _strip_signatures(surface)
+
+    due = set()
+    for (dir_index, *_), signature in zip(_motion_regions, signatures):
+        ref = _motion_refs[dir_index]
         if (
-            _right_y_min <= cy <= _right_y_max
-            and stop["right"] - roi_depth_density <= right_edge <= stop["right"] + 10
+            ref is None
+            or ref.shape != signature.shape
+            or now - _strip_refreshed_at[dir_index] >= settings.yolo_max_staleness
+            or np.any(np.abs(signature - ref) > motion_pixel_threshold)
         ):
-            dir_index = 0
+            due.add(dir_index)
 
-        # Direction 1 (down, moving South)
-        elif (
-            _down_x_min <= cx <= _down_x_max
-            and stop["down"] - roi_depth_density <= bottom_edge <= stop["down"] + 10
-        ):
-            dir_index = 1
+    # Full-frame detection refreshes every direction at once
+    if due and not settings.yolo_roi_crops:
+        due = {dir_index for dir_index, *_ in _roi_strips}
 
-        # Direction 2 (left, moving West)
-        elif (
-            _left_y_min <= cy <= _left_y_max
-            and stop["left"] - 10 <= left_edge <= stop["left"] + roi_depth_density
-        ):
-            dir_index = 2
+    for dir_index in due:
+        _motion_refs[dir_index] = signatures[dir_index]
+        _strip_refreshed_at[dir_index] = now
 
-        # Direction 3 (up, moving North)
-        elif (
-            _up_x_min <= cx <= _up_x_max
-            and stop["up"] - 10 <= top_edge <= stop["up"] + roi_depth_density
-        ):
-            dir_index = 3
+    return due
+
+# Whether this YOLO update needs the detector, & which strips (None: all)
+# (tracking: only every yolo_detect_every-th update; gating: only strips where something moved)
+def _detection_due(surface: pygame.Surface) -> tuple[bool, set | None]:
 
-        if dir_index is None:
-            continue
+    global _frames_skipped, _yolo_updates
 
-        # Accumulate density
-        dens[dir_index] += weight
+    if settings.yolo_tracking:
+        _yolo_updates += 1
+        if (_yolo_updates - 1) % settings.yolo_detect_every:
+            return False, None
 
-        # Queue length (no of cars at stop line)
-        if dir_index == 0: # right
-            if stop["right"] - roi_depth_queue <= right_edge <= stop["right"] + 10:
-                q[0] += 1
+    # Nothing moved since the last detection: keep the published results & skip the capture too
+    dirs = None
+    if settings.yolo_motion_gating:
+        dirs = _strips_to_refresh(surface)
+        if not dirs:
+            _frames_skipped += 1
+            # Tracked vehicles are standing still (unless an older frame is still being detected:
+            # it must reach the tracker first)
+            if settings.yolo_tracking and not _frame_in_flight:
+                _track([], settings.sim_clock.now)
+            return False, None
 
-        elif dir_index == 1: # down
-            if stop["down"] - roi_depth_queue <= bottom_edge <= stop["down"] + 10:
-                q[1] += 1
+    return True, dirs
 
-        elif dir_index == 2: # left
-            if stop["left"] - 10 <= left_edge <= stop["left"] + roi_depth_queue:
-                q[2] += 1
+# Store the newest lane results for the controller & stats window
+def _publish(dens: list, q: list, wait: list | None = None):
 
-        elif dir_index == 3: # up
-            if stop["up"] - 10 <= top_edge <= stop["up"] + roi_depth_queue:
-                q[3] += 1
+    global _lane_density, _lane_queue, _lane_wait
 
     with _model_lock:
         _lane_density = dens
         _lane_queue = q
+        if wait is not None:
+            _lane_wait = wait
+
+# Fold one detector run into the tracker & publish the tracked lane state
+# (detections from _detect_boxes; an empty list means nothing moved anywhere)
+def _track(detections: list, now: float):
+
+    regions = []
+    kept_boxes = [np.empty((0, 4), dtype=np.float32)]
+    kept_cls = [np.empty(0, dtype=int)]
+
+    for strip_dir, boxes, cls_ids in detections:
+        if strip_dir is None:
+            regions = None # full frame
+        else:
+            regions.append(_roi_strips[strip_dir][1:])
+
+            # Overlapping strips: keep each vehicle once, in the strip of its own direction
+            keep = _box_directions(boxes) == strip_dir
+            boxes, cls_ids = boxes[keep], cls_ids[keep]
+
+        kept_boxes.append(boxes)
+        kept_cls.append(cls_ids)
+
+    with _tracker_lock:
+        _tracker.update(np.concatenate(kept_boxes), np.concatenate(kept_cls), now, regions)
+
+    _publish_tracks(now)
+
+# Publish density, queue & wait from tracked boxes extrapolated to `now`
+def _publish_tracks(now: float):
+
+    with _tracker_lock:
+        _, boxes, cls_ids, waits = _tracker.snapshot(now)
+
+    dens = [0.0] * settings.no_of_signals
+    q = [0] * settings.no_of_signals
+    _bin_boxes(dens, q, boxes, cls_ids)
+
+    # Mean time the tracked vehicles of each approach have spent stopped
+    dir_index = _box_directions(boxes)
+    wait = [0.0] * settings.no_of_signals
+    for i in range(settings.no_of_signals):
+        in_lane = dir_index == i
+        if in_lane.any():
+            wait[i] = float(waits[in_lane].mean())
+
+    _publish(dens, q, wait)
+
+# Carry tracked boxes forward to the current simulated time (call every frame)
+def update_yolo_tracks():
+
+    if _model is None or not settings.yolo_tracking:
+        return
+
+    _publish_tracks(settings.sim_clock.now)
+
+# Run YOLO on Pygame (blocks the caller for the whole forward pass)
+def update_yolo_from_surface(surface: pygame.Surface):
+
+    if _model is None:
+        return
+
+    due, dirs = _detection_due(surface)
+    if not due:
+        return
+
+    frame_bgr = _surface_to_bgr(surface)
+    if settings.yolo_tracking:
+        _track(_detect_boxes(frame_bgr, dirs), settings.sim_clock.now)
+    else:
+        _publish(*_detect(frame_bgr, dirs))
+    _release_frame(frame_bgr)
+
+# Hand the current view to the background worker; never waits for the model
+def submit_yolo_frame(surface: pygame.Surface):
+
+    global _mailbox, _mailbox_dirs, _mailbox_time, _frames_dropped, _frame_in_flight
+
+    if _model is None or _worker is None:
+        return
+
+    due, dirs = _detection_due(surface)
+    if not due:
+        return
+
+    frame_bgr = _surface_to_bgr(surface)
+
+    with _mailbox_cond:
+        if _mailbox is not None:
+            _frames_dropped += 1 # worker still busy; only the latest frame matters
+            _free_frames.append(_mailbox)
+
+            # The replaced frame's strips still need detecting
+            if dirs is not None and _mailbox_dirs is not None:
+                dirs = dirs | _mailbox_dirs
+            else:
+                dirs = None
+        _mailbox = frame_bgr
+        _mailbox_dirs = dirs
+        _mailbox_time = settings.sim_clock.now
+        _frame_in_flight = True
+        _mailbox_cond.notify()
+
+# Worker loop: take the latest frame, run YOLO & publish, until stopped
+def _yolo_worker(stop: threading.Event):
+
+    global _mailbox, _frame_in_flight
+
+    while True:
+        with _mailbox_cond:
+            while _mailbox is None and not stop.is_set():
+                _mailbox_cond.wait()
+
+            if stop.is_set():
+                return
+
+            frame_bgr = _mailbox
+            dirs = _mailbox_dirs
+            frame_time = _mailbox_time
+            _mailbox = None
+
+        try:
+            detections = _detect_boxes(frame_bgr, dirs)
+
+            # Stopped during the forward pass: the result belongs to a run that has ended
+            if not stop.is_set():
+                if settings.yolo_tracking:
+                    _track(detections, frame_time)
+                else:
+                    _publish(*_lane_results(detections))
+        except Exception as e:
+            print("[YOLO] Inference failed:", e)
+
+        _release_frame(frame_bgr)
+
+        with _mailbox_cond:
+            if stop.is_set():
+                return
+            if _mailbox is None:
+                _frame_in_flight = False
+
+# Start the background inference worker (once per simulation run)
+def start_yolo_worker():
+
+    global _worker, _worker_stop, _mailbox, _frames_dropped, _frames_skipped, _tracker, _yolo_updates
+    global _frame_in_flight, _stopped_worker
+
+    if _worker is not None:
+        return
+
+    # Let the previous run's last forward pass end before resetting the run state
+    # (one predict on the model at a time)
+    if _stopped_worker is not None:
+        _stopped_worker.join(timeout=worker_join_timeout)
+        _stopped_worker = None
+
+    with _mailbox_cond:
+        _mailbox = None
+        _frames_dropped = 0
+        _frame_in_flight = False
+
+    # Every strip is detected on the first frame of a run
+    _motion_refs[:] = [None] * settings.no_of_signals
+    _strip_refreshed_at[:] = [float("-inf")] * settings.no_of_signals
+    _strip_results.clear()
+    _frames_skipped = 0
+
+    # Tracks & lane estimates start over every run
+    with _tracker_lock:
+        _tracker = BoxTracker()
+    _yolo_updates = 0
+    _publish([0.0] * settings.no_of_signals, [0] * settings.no_of_signals, [0.0] * settings.no_of_signals)
+
+    # Daemon so a window close never waits on a forward pass
+    _worker_stop = threading.Event()
+    _worker = threading.Thread(target=_yolo_worker, args=(_worker_stop,), name="yolo-worker", daemon=True)
+    _worker.start()
+
+# Stop the worker (a forward pass in progress still finishes in the background, & its result is dropped)
+def stop_yolo_worker():
+
+    global _worker, _worker_stop, _mailbox, _stopped_worker
+
+    if _worker is None:
+        return
+
+    with _mailbox_cond:
+        _worker_stop.set()
+        _mailbox = None
+        _mailbox_cond.notify_all()
+
+    _stopped_worker = _worker
+    _worker = None
+    _worker_stop = None
+
+    report_inference_latency()
+
+# Run YOLO on one BGR frame: screen-space detections per detected region
+# [(strip_dir, boxes, cls_ids)], strip_dir None for the full frame
+# (dirs: with ROI crops, only these strips are detected)
+def _detect_boxes(frame_bgr: np.ndarray, dirs: set | None = None) -> list:
+
+    # Optional smaller detector input (cheaper CPU inference)
+    kwargs = {"verbose": False, **_predict_kwargs}
+    if settings.yolo_imgsz is not None:
+        kwargs["imgsz"] = settings.yolo_imgsz
+
+    if settings.yolo_roi_crops:
+        # Only the approach strips, as one batch (crops are views into the frame)
+        strips = [strip for strip in _roi_strips if dirs is None or strip[0] in dirs]
+        crops = [frame_bgr[y0:y1, x0:x1] for _, x0, y0, x1, y1 in strips]
+        results = _timed_predict(crops, kwargs) if crops else []
+
+        # Crop -> screen coordinates
+        return [
+            (strip_dir, *_result_boxes(result, np.array([x0, y0, x0, y0], dtype=np.float32)))
+            for (strip_dir, x0, y0, _, _), result in zip(strips, results)
+        ]
+
+    # Run YOLO
+    results = _timed_predict(frame_bgr, kwargs)[0]
+    return [(None, *_result_boxes(results))]
+
+# Bounding boxes (N, 4) & class ids (N,) of one result, shifted by `offset`
+def _result_boxes(result, offset: np.ndarray | float = 0.0) -> tuple:
+
+    if result.boxes is None:
+        return np.empty((0, 4), dtype=np.float32), np.empty(0, dtype=int)
+
+    boxes = result.boxes.xyxy.cpu().numpy() + offset
+    cls_ids = result.boxes.cls.cpu().numpy().astype(int)
+    return boxes, cls_ids
+
+# Run YOLO on one BGR frame & bin detections into per-direction density/queue
+# (dirs: with ROI crops, only these strips are re-detected; the others keep their last result)
+def _detect(frame_bgr: np.ndarray, dirs: set | None = None) -> tuple[list, list]:
+    return _lane_results(_detect_boxes(frame_bgr, dirs))
+
+# Per-direction density/queue from one detector run (detections from _detect_boxes)
+def _lane_results(detections: list) -> tuple[list, list]:
+
+    dens = [0.0] * settings.no_of_signals
+    q = [0] * settings.no_of_signals
+
+    if not settings.yolo_roi_crops:
+        _, boxes, cls_ids = detections[0]
+        _bin_boxes(dens, q, boxes, cls_ids)
+        return dens, q
+
+    for strip_dir, boxes, cls_ids in detections:
+        strip_dens = [0.0] * settings.no_of_signals
+        strip_q = [0] * settings.no_of_signals
+        _bin_boxes(strip_dens, strip_q, boxes, cls_ids, strip_dir)
+        _strip_results[strip_dir] = (strip_dens[strip_dir], strip_q[strip_dir])
+
+    for dir_index, (strip_dens, strip_q) in _strip_results.items():
+        dens[dir_index] = strip_dens
+        q[dir_index] = strip_q
+
+    return dens, q
+
+# One forward pass, recording its latency
+def _timed_predict(source, kwargs: dict):
+
+    start = time.perf_counter()
+    results = _model(source, **kwargs)
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+
+    with _model_lock:
+        _latency_ms.append(elapsed_ms)
+
+    return results
+
+# Add screen-space detections to the per-direction density/queue
+# (strip_dir: only keep boxes of that direction, so overlapping strips don't count a vehicle twice)
+def _bin_boxes(dens: list, q: list, boxes: np.ndarray, cls_ids: np.ndarray, strip_dir: int | None = None):
+
+    if len(boxes) == 0:
+        return
+
+    stop = settings.stop_lines
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    dir_index = _box_directions(boxes)
+
+    # Known vehicle classes only
+    class_weights, class_is_vehicle = _class_tables()
+    known = (cls_ids >= 0) & (cls_ids < len(class_weights))
+    cls_safe = np.where(known, cls_ids, 0)
+    keep = known & class_is_vehicle[cls_safe] & (dir_index >= 0)
+    if strip_dir is not None:
+        keep &= dir_index == strip_dir
+
+    # Queue length (no of cars at stop line)
+    near_stop = np.select(
+        [dir_index == 0, dir_index == 1, dir_index == 2, dir_index == 3],
+        [
+            (stop["right"] - roi_depth_queue <= x2) & (x2 <= stop["right"] + 10),
+            (stop["down"] - roi_depth_queue <= y2) & (y2 <= stop["down"] + 10),
+            (stop["left"] - 10 <= x1) & (x1 <= stop["left"] + roi_depth_queue),
+            (stop["up"] - 10 <= y1) & (y1 <= stop["up"] + roi_depth_queue),
+        ],
+        False,
+    )
+
+    # Weighted density & queue counts per direction
+    kept_dirs = dir_index[keep]
+    density_sums = np.bincount(kept_dirs, weights=class_weights[cls_safe[keep]], minlength=settings.no_of_signals)
+    queue_counts = np.bincount(dir_index[keep & near_stop], minlength=settings.no_of_signals)
+
+    for i in range(settings.no_of_signals):
+        dens[i] += float(density_sums[i])
+        q[i] += int(queue_counts[i])
+
+# Approach direction of each screen-space box (-1: outside every lane band & density ROI)
+def _box_directions(boxes: np.ndarray) -> np.ndarray:
+
+    stop = settings.stop_lines
+
+    x1, y1, x2, y2 = boxes[:, 0], boxes[:, 1], boxes[:, 2], boxes[:, 3]
+    cx = 0.5 * (x1 + x2)
+    cy = 0.5 * (y1 + y2)
+
+    # Lane band & density ROI per direction (first match wins, like the old if/elif chain)
+    return np.select(
+        [
+            # Direction 0 (right, moving East)
+            (_right_y_min <= cy) & (cy <= _right_y_max)
+            & (stop["right"] - roi_depth_density <= x2) & (x2 <= stop["right"] + 10),
+            # Direction 1 (down, moving South)
+            (_down_x_min <= cx) & (cx <= _down_x_max)
+            & (stop["down"] - roi_depth_density <= y2) & (y2 <= stop["down"] + 10),
+            # Direction 2 (left, moving West)
+            (_left_y_min <= cy) & (cy <= _left_y_max)
+            & (stop["left"] - 10 <= x1) & (x1 <= stop["left"] + roi_depth_density),
+            # Direction 3 (up, moving North)
+            (_up_x_min <= cx) & (cx <= _up_x_max)
+            & (stop["up"] - 10 <= y1) & (y1 <= stop["up"] + roi_depth_density),
+        ],
+        [0, 1, 2, 3],
+        -1,
+    )
 
 # Retrieve number of vehicles from each lane
 def get_lane_density(dir_index: int) -> float:
@@ -185,4 +750,9 @@ def get_lane_density(dir_index: int) -> float:
 # Retrieve number of vehicles at stop line
 def get_lane_queue(dir_index: int) -> int:
     with _model_lock:
-        return int(_lane_queue[dir_index])
\ No newline at end of file
+        return int(_lane_queue[dir_index])
+
+# Retrieve mean time (s) tracked vehicles in a lane have spent stopped
+def get_lane_wait(dir_index: int) -> float:
+    with _model_lock:
+        return float(_lane_wait[dir_index])
\ No newline at end of file
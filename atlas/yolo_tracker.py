@@ -0,0 +1,175 @@
+# Lightweight IoU/centroid tracker: carries YOLO boxes forward between detector runs with stable track IDs
+import numpy as np
+
+iou_match_threshold = 0.3 # min overlap to continue a track
+centroid_match_distance = 20.0 # px; fallback match for boxes that no longer overlap (fast or small vehicles)
+max_vehicle_speed = 200.0 # px/s; widens the centroid gate with the time since a track was last seen
+max_misses = 2 # detector runs a track survives without a match
+velocity_smoothing = 0.5 # weight of the newest velocity measurement
+stopped_speed = 5.0 # px/s; slower tracks count as waiting
+reverse_tolerance = 5.0 # px a moving track may appear to move backwards (box jitter)
+
+class BoxTracker:
+
+    def __init__(self):
+        self.next_id = 0
+        self.ids = np.empty(0, dtype=np.int64) # Stable track IDs
+        self.boxes = np.empty((0, 4)) # (x1, y1, x2, y2) at the last detection
+        self.velocity = np.empty((0, 2)) # px per simulated second
+        self.cls_ids = np.empty(0, dtype=int)
+        self.hits = np.empty(0, dtype=int) # Detections matched so far
+        self.misses = np.empty(0, dtype=int) # Detector runs in a row without a match
+        self.last_seen = np.empty(0) # Simulated time of the last detection
+        self.waited = np.empty(0) # Simulated seconds spent stopped (up to last_seen)
+        self.updated_at = float("-inf") # Simulated time of the newest detector run folded in
+
+    # Boxes extrapolated to a simulated time (constant velocity since the last detection)
+    def predict(self, now: float) -> np.ndarray:
+        shift = self.velocity * (now - self.last_seen)[:, None]
+        return self.boxes + np.hstack([shift, shift])
+
+    # Fold in one detector run taken at `now`
+    # (regions: screen rects that were detected; tracks outside them are unchanged, None: whole screen)
+    def update(self, boxes: np.ndarray, cls_ids: np.ndarray, now: float, regions: list | None = None):
+
+        # A run older than one already folded in (frames finishing out of order) would make dt negative
+        if now < self.updated_at:
+            return
+        self.updated_at = now
+
+        predicted = self.predict(now)
+        dt = now - self.last_seen
+
+        # Tracks last seen where the detector did not look this time: nothing moved there
+        inside = np.ones(len(self.ids), dtype=bool)
+        if regions is not None:
+            cx, cy = _centroids(self.boxes).T
+            inside[:] = False
+            for x0, y0, x1, y1 in regions:
+                inside |= (x0 <= cx) & (cx < x1) & (y0 <= cy) & (cy < y1)
+
+        frozen = np.flatnonzero(~inside)
+        self.velocity[frozen] = 0.0
+        self.waited[frozen] += dt[frozen]
+        self.last_seen[frozen] = now
+
+        candidates = np.flatnonzero(inside)
+        gate = centroid_match_distance + max_vehicle_speed * dt[candidates]
+
+        # Moving tracks never match backwards (a follower that moved into its leader's old spot
+        # must not take over the leader's track)
+        speed = np.hypot(*self.velocity[candidates].T)
+        heading = self.velocity[candidates] / np.maximum(speed, 1e-6)[:, None]
+        heading[speed < stopped_speed] = 0.0
+        moved = _centroids(boxes)[None] - _centroids(self.boxes[candidates])[:, None]
+        forward = np.einsum("tdk,tk->td", moved, heading) >= -reverse_tolerance
+
+        matched, det_idx = _match(predicted[candidates], boxes, gate, self.misses[candidates], forward)
+        track_idx = candidates[matched]
+
+        # Matched tracks: new box & class, smoothed velocity, time spent stopped
+        if len(track_idx):
+            step = np.maximum(dt[track_idx], 1e-6)[:, None]
+            measured = (_centroids(boxes[det_idx]) - _centroids(self.boxes[track_idx])) / step
+            first = (self.hits[track_idx] == 1)[:, None]
+            self.velocity[track_idx] = np.where(
+                first,
+                measured,
+                velocity_smoothing * measured + (1.0 - velocity_smoothing) * self.velocity[track_idx],
+            )
+
+            stopped = np.hypot(*self.velocity[track_idx].T) < stopped_speed
+            self.waited[track_idx] += np.where(stopped, dt[track_idx], 0.0)
+
+            self.boxes[track_idx] = boxes[det_idx]
+            self.cls_ids[track_idx] = cls_ids[det_idx]
+            self.hits[track_idx] += 1
+            self.misses[track_idx] = 0
+            self.last_seen[track_idx] = now
+
+        # Unmatched tracks inside the detected area coast until they have missed too often
+        missed = np.setdiff1d(candidates, track_idx)
+        self.misses[missed] += 1
+        self._keep(self.misses <= max_misses)
+
+        # Unmatched detections start new tracks
+        new = np.setdiff1d(np.arange(len(boxes)), det_idx)
+        self._add(boxes[new], cls_ids[new], now)
+
+    # Tracks seen in the latest detector run, extrapolated to `now`: (ids, boxes, cls_ids, waits)
+    def snapshot(self, now: float) -> tuple:
+        live = self.misses == 0
+
+        # Time stopped since the last detection counts too
+        stopped = np.hypot(*self.velocity[live].T) < stopped_speed
+        waits = self.waited[live] + np.where(stopped, now - self.last_seen[live], 0.0)
+
+        return self.ids[live], self.predict(now)[live], self.cls_ids[live], waits
+
+    # Drop every track not in `keep`
+    def _keep(self, keep: np.ndarray):
+        self.ids = self.ids[keep]
+        self.boxes = self.boxes[keep]
+        self.velocity = self.velocity[keep]
+        self.cls_ids = self.cls_ids[keep]
+        self.hits = self.hits[keep]
+        self.misses = self.misses[keep]
+        self.last_seen = self.last_seen[keep]
+        self.waited = self.waited[keep]
+
+    # Start tracks for new detections
+    def _add(self, boxes: np.ndarray, cls_ids: np.ndarray, now: float):
+        count = len(boxes)
+        self.ids = np.concatenate([self.ids, np.arange(self.next_id, self.next_id + count)])
+        self.next_id += count
+        self.boxes = np.concatenate([self.boxes, boxes])
+        self.velocity = np.concatenate([self.velocity, np.zeros((count, 2))])
+        self.cls_ids = np.concatenate([self.cls_ids, cls_ids])
+        self.hits = np.concatenate([self.hits, np.ones(count, dtype=int)])
+        self.misses = np.concatenate([self.misses, np.zeros(count, dtype=int)])
+        self.last_seen = np.concatenate([self.last_seen, np.full(count, now)])
+        self.waited = np.concatenate([self.waited, np.zeros(count)])
+
+# Box centres (N, 2)
+def _centroids(boxes: np.ndarray) -> np.ndarray:
+    return 0.5 * (boxes[:, :2] + boxes[:, 2:])
+
+# Pairwise IoU (tracks x detections)
+def _iou_matrix(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    inter = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return inter / np.maximum(union, 1e-6)
+
+# Greedy one-to-one matching: best overlaps first, then nearest centres (within each track's gate) for what is left
+# (tracks seen most recently pick first, so a coasting track can't take a live track's detection)
+def _match(tracks: np.ndarray, detections: np.ndarray, gate: np.ndarray, misses: np.ndarray, allowed: np.ndarray) -> tuple:
+
+    if len(tracks) == 0 or len(detections) == 0:
+        return np.empty(0, dtype=int), np.empty(0, dtype=int)
+
+    iou = _iou_matrix(tracks, detections)
+    distance = np.linalg.norm(_centroids(tracks)[:, None] - _centroids(detections)[None], axis=2)
+
+    used_tracks = np.zeros(len(tracks), dtype=bool)
+    used_detections = np.zeros(len(detections), dtype=bool)
+    track_idx = []
+    det_idx = []
+
+    for score, ok in ((iou, iou >= iou_match_threshold), (-distance, distance <= gate[:, None])):
+        ok &= allowed
+        pairs = np.argwhere(ok)
+        for t, d in pairs[np.lexsort((-score[ok], misses[pairs[:, 0]]))]:
+            if not used_tracks[t] and not used_detections[d]:
+                used_tracks[t] = True
+                used_detections[d] = True
+                track_idx.append(t)
+                det_idx.append(d)
+
+    return np.array(track_idx, dtype=int), np.array(det_idx, dtype=int)
\ No newline at end of file
@@ -0,0 +1,304 @@
+# Accuracy vs latency benchmark: ATLAS YOLO lane estimates against exact simulator state
+# (frames are drawn as the live ATLAS window looks when it submits one: road, title, HUD text, buttons,
+# signals & vehicles; the FPS counter & cursor are drawn after the live capture, so they are left out here too)
+import os
+import sys
+import time
+import argparse
+import contextlib
+import numpy as np
+
+# Runs without a window
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font
+from atlas import settings
+from atlas import yolo_intergation as yolo
+from atlas.ui_helpers import draw_small_button, render_text
+from atlas.export_stats import sec_to_min_sec
+from atlas.sprite_cache import preload_vehicle_images, get_sprite
+from atlas.controller import init_signals, start_simulation_tasks, advance_clock
+
+# YOLO class name -> class id (ground-truth boxes use the detector's ids)
+class_name_to_id = {name: i for i, name in yolo.yolo_class_id_to_name.items()}
+
+# Exact density & queue per direction: every vehicle's true box through the detector's own lane/ROI rules
+def exact_lane_state() -> tuple[list, list]:
+
+    sprites = settings.simulation.sprites()
+    boxes = np.empty((len(sprites), 4), dtype=np.float32)
+    cls_ids = np.empty(len(sprites), dtype=int)
+
+    for i, v in enumerate(sprites):
+        rect = v.current_image.get_rect()
+        boxes[i] = (v.x, v.y, v.x + rect.width, v.y + rect.height)
+        cls_ids[i] = class_name_to_id.get(v.vehicle_class, -1)
+
+    dens = [0.0] * settings.no_of_signals
+    q = [0] * settings.no_of_signals
+    yolo._bin_boxes(dens, q, boxes, cls_ids)
+    return dens, q
+
+# Sprites, fonts & static layout of the live ATLAS window (same values as atlas.py)
+def load_scene():
+
+    font_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "atlas", "assets", "fonts")
+    timer_font_path = os.path.join(font_dir, "Anton-Regular.ttf")
+    title_font = pygame.font.Font(os.path.join(font_dir, "LuckiestGuy-Regular.ttf"), 33)
+
+    # Title is part of the static scenery
+    background = get_sprite("street_background").convert()
+    background.blit(title_font.render("ATLAS Traffic Simulator", True, (255, 255, 255)), (90, 30))
+
+    back_button = pygame.Rect(0, 0, 110, 36)
+    back_button.bottomright = (settings.screen_width - 20, settings.screen_height - 20)
+
+    return {
+        "background": background,
+        "signals": {state: get_sprite("signals/" + state) for state in ("red", "yellow", "green")},
+        "font": pygame.font.Font(None, 30),
+        "timer_font": pygame.font.Font(timer_font_path, 25),
+        "music_font": pygame.font.Font(timer_font_path, 18),
+        "back_font": pygame.font.Font(None, 26),
+        "back_button": back_button,
+        "sound_on": get_sprite("sound_on"),
+    }
+
+# Draw what the detector sees in the live window at capture time (music on, mouse away from the buttons)
+def render_frame(screen, scene):
+
+    black = (0, 0, 0)
+    white = (255, 255, 255)
+    screen.blit(scene["background"], (0, 0))
+
+    # Back button & music toggle
+    draw_small_button(
+        screen, scene["back_button"], "Back", scene["back_font"], (60, 60, 60), (110, 110, 110), (-1, -1)
+    )
+
+    icon_rect = scene["sound_on"].get_rect()
+    icon_rect.top = 12
+    icon_rect.right = settings.screen_width - 12
+    label_surf = render_text(scene["music_font"], "Music: ON", white)
+    label_rect = label_surf.get_rect()
+    label_rect.centery = icon_rect.centery
+    label_rect.right = icon_rect.left - 8
+    screen.blit(label_surf, label_rect)
+    screen.blit(scene["sound_on"], icon_rect)
+
+    for i in range(settings.no_of_signals):
+        if i != settings.current_green:
+            state = "red"
+        elif settings.current_yellow == 1:
+            state = "yellow"
+        else:
+            state = "green"
+        screen.blit(scene["signals"][state], settings.signal_coords[i])
+
+    # Signal timers, passed counters & overall timer (drawn under the vehicles, as in the live window)
+    for i in range(settings.no_of_signals):
+        timer_text = render_text(scene["font"], str(settings.signals[i].signal_text), white, black)
+        screen.blit(timer_text, settings.signal_timer_coords[i])
+
+        count = settings.vehicles[settings.direction_numbers[i]]["crossed"]
+        screen.blit(render_text(scene["font"], str(count), black, white), settings.vehicle_count_coords[i])
+
+    elapsed_text = "Time elapsed: " + sec_to_min_sec(settings.time_elapsed)
+    screen.blit(render_text(scene["timer_font"], elapsed_text, black, white), (1100, 50))
+
+    for v in settings.simulation:
+        screen.blit(v.current_image, (v.x, v.y))
+
+# Run one detector configuration over a seeded simulation
+# (the controller is fed exact lane state, so traffic is identical for every configuration)
+def run_config(screen, scene, seed, duration, base_interval):
+
+    settings.reset_for_new_run()
+
+    # Seeded arrivals for this run only (restored for whatever runs next in this process)
+    configured_arrival_seed = settings.arrival_seed
+    settings.arrival_seed = seed
+    try:
+        return _run_seeded(screen, scene, duration, base_interval)
+    finally:
+        settings.arrival_seed = configured_arrival_seed
+
+def _run_seeded(screen, scene, duration, base_interval):
+
+    init_signals()
+    start_simulation_tasks()
+
+    dt = settings.sim_clock.tick_seconds
+    ticks_per_update = settings.sim_clock.to_ticks(base_interval)
+    total_ticks = settings.sim_clock.to_ticks(duration)
+
+    exact = [] # per tick: (dens, q)
+    detected = [] # per detector update: (dens, q)
+    latency_ms = []
+
+    for tick in range(total_ticks):
+        advance_clock()
+
+        for v in settings.simulation.sprites():
+            v.move(dt)
+            if v.has_left_map():
+                v.retire()
+
+        dens, q = exact_lane_state()
+        yolo._publish(dens, q) # oracle input for the controller
+        exact.append((dens, q))
+
+        # Capture & detect every base interval (coarser intervals reuse these results)
+        if tick % ticks_per_update == 0:
+            render_frame(screen, scene)
+
+            start = time.perf_counter()
+            frame_bgr = yolo._surface_to_bgr(screen)
+            detected.append(yolo._detect(frame_bgr))
+            yolo._release_frame(frame_bgr)
+            latency_ms.append((time.perf_counter() - start) * 1000.0)
+
+    settings.simulation_running = False
+    return exact, detected, latency_ms, ticks_per_update
+
+# Error distribution of held (stale) estimates at one update interval against per-tick exact values
+def score_interval(exact, detected, ticks_per_update, step):
+
+    dens_err = []
+    queue_err = []
+
+    for tick, (exact_dens, exact_q) in enumerate(exact):
+        # Latest estimate published at this update interval
+        update = (tick // (ticks_per_update * step)) * step
+        est_dens, est_q = detected[update]
+        for i in range(settings.no_of_signals):
+            dens_err.append(est_dens[i] - exact_dens[i])
+            queue_err.append(est_q[i] - exact_q[i])
+
+    dens_err = np.array(dens_err)
+    queue_err = np.array(queue_err)
+
+    return {
+        "density_mae": float(np.mean(np.abs(dens_err))),
+        "density_p95_abs": float(np.percentile(np.abs(dens_err), 95)),
+        "density_bias": float(np.mean(dens_err)),
+        "queue_mae": float(np.mean(np.abs(queue_err))),
+        "queue_p95_abs": float(np.percentile(np.abs(queue_err), 95)),
+        "queue_bias": float(np.mean(queue_err)),
+    }
+
+# Every backend × image size × crop mode, scored at every update interval
+def run_benchmark(backends, imgszs, roi_modes, intervals, seed, duration):
+
+    pygame.init()
+    screen = pygame.display.set_mode((settings.screen_width, settings.screen_height))
+
+    preload_vehicle_images()
+    scene = load_scene()
+
+    # Update intervals are whole multiples of the shortest one
+    base_interval = min(intervals)
+    steps = [max(1, int(round(interval / base_interval))) for interval in intervals]
+
+    rows = []
+    for backend in backends:
+        yolo.release_yolo()
+        yolo.init_yolo(device=settings.yolo_device, backend=backend)
+
+        for imgsz in imgszs:
+            for roi_crops in roi_modes:
+                settings.yolo_imgsz = imgsz
+                settings.yolo_roi_crops = roi_crops
+
+                # Warm-up pass on the empty road (first inference includes lazy initialisation)
+                screen.blit(scene["background"], (0, 0))
+                frame_bgr = yolo._surface_to_bgr(screen)
+                yolo._detect(frame_bgr)
+                yolo._release_frame(frame_bgr)
+
+                with open(os.devnull, "w") as sink, contextlib.redirect_stdout(sink):
+                    exact, detected, latency_ms, ticks_per_update = run_config(
+                        screen, scene, seed, duration, base_interval
+                    )
+
+                for interval, step in zip(intervals, steps):
+                    row = {
+                        "backend": backend,
+                        "imgsz": imgsz if imgsz is not None else "default",
+                        "roi_crops": roi_crops,
+                        "update_interval": interval,
+                        "inferences": len(latency_ms),
+                        "latency_mean_ms": float(np.mean(latency_ms)),
+                        "latency_p95_ms": float(np.percentile(latency_ms, 95)),
+                    }
+
+                    # Whether the detector can sustain this update rate on this machine
+                    row["keeps_up"] = row["latency_p95_ms"] <= interval * 1000.0
+                    row.update(score_interval(exact, detected, ticks_per_update, step))
+                    rows.append(row)
+
+                    print(
+                        "[benchmark] " + backend + " imgsz=" + str(row["imgsz"]) + " roi=" + str(roi_crops)
+                        + " every " + str(interval) + "s: latency p95 = " + ("%.1f" % row["latency_p95_ms"]) + " ms"
+                        + ", density MAE = " + ("%.2f" % row["density_mae"])
+                        + ", queue MAE = " + ("%.2f" % row["queue_mae"])
+                    )
+
+    yolo.release_yolo()
+    pygame.quit()
+    return rows
+
+# One row per (configuration, update interval)
+def export_benchmark_to_xlsx(rows, filepath):
+
+    columns = list(rows[0].keys())
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Detector benchmark"
+
+    for col, name in enumerate(columns, start=1):
+        ws.cell(row=1, column=col, value=name).font = Font(bold=True)
+        ws.column_dimensions[get_column_letter(col)].width = max(len(name), 10) + 2
+
+    for row_idx, row in enumerate(rows, start=2):
+        for col, name in enumerate(columns, start=1):
+            ws.cell(row=row_idx, column=col, value=row[name])
+
+    ws.freeze_panes = "A2"
+    wb.save(filepath)
+    print("[benchmark] results exported to", filepath)
+
+# "default" / "none" -> model default image size
+def parse_imgsz(value):
+
+    if value.lower() in ("default", "none"):
+        return None
+    return int(value)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Compare ATLAS YOLO estimates with exact simulator state")
+    parser.add_argument("--backends", nargs="+", choices=["torch", "onnx", "onnx-int8"], default=["torch"])
+    parser.add_argument("--imgsz", nargs="+", type=parse_imgsz, default=[None], help="detector input sizes")
+    parser.add_argument("--roi", nargs="+", choices=["full", "crops"], default=["full", "crops"])
+    parser.add_argument("--intervals", nargs="+", type=float, default=[0.2, 0.5, 1.0], help="update intervals (s)")
+    parser.add_argument("--seed", type=int, default=1, help="arrival schedule seed")
+    parser.add_argument("--duration", type=float, default=60.0, help="simulated seconds per configuration")
+    parser.add_argument("--out", default="detector_benchmark.xlsx", help="output excel file")
+    args = parser.parse_args()
+
+    rows = run_benchmark(
+        args.backends,
+        args.imgsz,
+        [mode == "crops" for mode in args.roi],
+        args.intervals,
+        args.seed,
+        args.duration,
+    )
+    if rows:
+        export_benchmark_to_xlsx(rows, args.out)
+    sys.exit(0)
\ No newline at end of file
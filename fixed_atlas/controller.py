@@ -1,9 +1,9 @@
 # Simulation logic & density functions for fixed-timer traffic lights
-import time
 import random
 from . import settings
 from .vehicle import Vehicle
 from .traffic_signal import TrafficSignal
+from .arrivals import schedule_for_run, replay_schedule
 
 # Count vehicles waiting near the stop line (ROI check)
 def count_near_stop(dir_index):
@@ -73,8 +73,8 @@ def signal_controller():
         settings.current_yellow = 0
 
         while settings.signals[current].green > 0 and settings.simulation_running:
-            
-            # AGlobal simulation timer
+
+            # Global simulation timer (green & yellow seconds; the pause between phases is not counted)
             settings.time_elapsed += 1
 
             # Show remaining green time on the current lane
@@ -86,7 +86,7 @@ def signal_controller():
                 if i != current:
                     settings.signals[i].signal_text = "---"
 
-            time.sleep(1)
+            yield 1
 
         if not settings.simulation_running:
             return
@@ -105,7 +105,7 @@ def signal_controller():
             settings.time_elapsed += 1
             settings.signals[current].signal_text = settings.signals[current].yellow
             settings.signals[current].yellow -= 1
-            time.sleep(1)
+            yield 1
 
         if not settings.simulation_running:
             return
@@ -130,11 +130,16 @@ def signal_controller():
         # Move to next lane
         settings.current_green = next_green
 
-        time.sleep(0.5)
+        yield 0.5
 
 # Vehicle generator
 def generate_vehicles():
 
+    # Replay a seeded arrival schedule instead of live random spawns
+    if settings.arrival_seed is not None:
+        yield from replay_schedule(schedule_for_run(), Vehicle)
+        return
+
     while settings.simulation_running:
 
         vehicle_type = random.randint(0, 4) # Random choice of vehicle class
@@ -176,9 +181,19 @@ def generate_vehicles():
             will_turn,
         )
 
-        # Check flag again during delay so it stops quickly
-        for _ in range(3):  # 3 * 0.50 = 1.5s total
-            if not settings.simulation_running:
-                return
-            
-            time.sleep(0.50) # Delay for every vehicle spawn
\ No newline at end of file
+        # Check flag again before the delay so it stops quickly
+        if not settings.simulation_running:
+            return
+
+        yield settings.spawn_interval # Delay for every vehicle spawn
+
+# Start controller & spawner tasks on the simulated clock
+def start_simulation_tasks():
+
+    settings.sim_clock.schedule(signal_controller())
+    settings.sim_clock.schedule(generate_vehicles())
+
+# Advance the simulated clock by whole ticks (runs any due controller/spawner steps)
+# (settings.time_elapsed is kept by the signal controller, as before the simulated clock)
+def advance_clock(ticks=1):
+    settings.sim_clock.advance(ticks)
\ No newline at end of file
@@ -0,0 +1,78 @@
+# Headless, faster-than-real-time runner for fixed-time traffic simulation
+# (no pygame window, no Tk stats window & no mixer)
+import os
+import random
+import argparse
+import contextlib
+from . import settings
+from .export_stats import collect_stats, sec_to_min_sec
+from .controller import init_signals, start_simulation_tasks, advance_clock
+
+# Simulate until the vehicle limit (or max_time) is reached
+def _simulate(max_time):
+
+    init_signals()
+    start_simulation_tasks()
+
+    while True:
+        advance_clock()
+
+        for v in settings.simulation.sprites():
+            v.move()
+            if v.has_left_map():
+                v.retire()
+
+        # Same end condition as the interactive loop
+        total_passed = (
+            settings.vehicles["right"]["crossed"]
+            + settings.vehicles["down"]["crossed"]
+            + settings.vehicles["left"]["crossed"]
+            + settings.vehicles["up"]["crossed"]
+        )
+        if total_passed > settings.vehicle_limit:
+            break
+
+        if max_time is not None and settings.sim_clock.now >= max_time:
+            break
+
+    # Stop controller & spawner tasks
+    settings.simulation_running = False
+
+# Run one simulation as fast as the CPU allows & return the exported metrics
+def run_headless(seed=None, max_time=None, verbose=False, arrival_seed=None):
+
+    # Reset settings for every new simulation
+    settings.reset_for_new_run()
+
+    if seed is not None:
+        random.seed(seed)
+
+    # Same arrivals for every controller that replays this seed
+    # (for this run only: later runs in this process get the configured seed)
+    configured_arrival_seed = settings.arrival_seed
+    if arrival_seed is not None:
+        settings.arrival_seed = arrival_seed
+
+    # Controller & spawner print every decision; keep batch runs quiet
+    try:
+        with open(os.devnull, "w") as sink, (contextlib.nullcontext() if verbose else contextlib.redirect_stdout(sink)):
+            _simulate(max_time)
+    finally:
+        settings.arrival_seed = configured_arrival_seed
+
+    return collect_stats()
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Run the fixed-time traffic simulation without a window")
+    parser.add_argument("--seed", type=int, default=None, help="random seed for vehicle spawns")
+    parser.add_argument("--max-time", type=float, default=None, help="stop after this many simulated seconds")
+    parser.add_argument("--verbose", action="store_true", help="print controller decisions")
+    parser.add_argument("--arrivals", type=int, default=None, help="replay the arrival schedule with this seed")
+    args = parser.parse_args()
+
+    result = run_headless(seed=args.seed, max_time=args.max_time, verbose=args.verbose, arrival_seed=args.arrivals)
+
+    print("[FIXED headless] time elapsed:", sec_to_min_sec(result["time_elapsed"]))
+    for key, value in result.items():
+        print("  " + key + ":", value)
\ No newline at end of file
@@ -1,6 +1,7 @@
 # Global constants & parameters
 import os
 import pygame
+from .sim_clock import SimClock
 
 # Base path of fixed_atlas folder
 base_path = os.path.dirname(__file__)
@@ -31,6 +32,7 @@ speeds = {
     "truck": 1.8,
     "rickshaw": 2.0,
     "bike": 2.5,
+    "ambulance": 3.0, # only spawned by arrival schedules
 }
 
 # Weight of each vehicle
@@ -40,6 +42,7 @@ density_weights = {
     "truck": 2.0,
     "rickshaw": 0.8,
     "bike": 0.5,
+    "ambulance": 1.5,
 }
 
 base_time_per_weight = 1.5
@@ -47,6 +50,14 @@ base_time_per_weight = 1.5
 # Stop simulation when more than [amount of vehicles] have crossed
 vehicle_limit = 250
 
+# Seconds between vehicle spawns
+spawn_interval = 1.5
+
+# Replay a pre-sampled arrival schedule with this seed (None = live random spawns)
+arrival_seed = None
+poisson_arrivals = False # scheduled arrival times follow a Poisson process instead of a fixed interval
+ambulance_cooldown = 60.0 # minimum seconds between scheduled ambulances
+
 # Lane wait stats: per direction index (0: right, 1: down, 2: left, 3: up)
 lane_wait_sum = [0.0, 0.0, 0.0, 0.0] # total wait time
 lane_wait_count = [0, 0, 0, 0] # number of vehicles counted
@@ -90,6 +101,10 @@ x = {d: coords[:] for d, coords in base_x.items()}
 y = {d: coords[:] for d, coords in base_y.items()}
 stops = {d: coords[:] for d, coords in base_stops.items()}
 
+# Map size; vehicles that have crossed & driven past it are retired
+screen_width = 1400
+screen_height = 800
+
 # Intersection centre used for turns
 mid = {
     "right": {"x": 705, "y": 445},
@@ -121,6 +136,14 @@ current_green = 0 # which lane is green light currently
 current_yellow = 0 # 0 = green/red, 1 = yellow
 time_elapsed = 0 # simulator start timer
 sim_time = 300 # maximum simulation duration
+sim_tick_rate = 60 # simulated clock ticks per second (one tick per movement step)
+render_fps = 60 # display frame cap (the simulation keeps sim_tick_rate ticks per wall second while frames stay under max_frame_time)
+
+# Wall seconds one rendered frame may simulate at most (stops a slow machine spiralling into ever longer frames).
+# Anything a slower frame took beyond it is dropped, not simulated: below 1 / max_frame_time FPS (4 at 0.25 s),
+# or on a single stall such as a window drag, simulated time falls behind wall time. Runs match simulated-time
+# progress across frame rates only while every frame stays under this limit.
+max_frame_time = 0.25
 
 # Reset simulation function
 def reset_for_new_run():
@@ -131,7 +154,7 @@ def reset_for_new_run():
     global queue_at_green_sum, queue_at_green_count
     global vehicles, x, y, stops
     global current_green, current_yellow, time_elapsed, simulation_running
-    global simulation
+    global simulation, sim_clock
     global last_ambulance_spawn_time
 
     # Reset counters
@@ -165,9 +188,12 @@ def reset_for_new_run():
     current_yellow = 0
     time_elapsed = 0
 
-    # Controls background threads and timers
+    # Controls controller & spawner tasks
     simulation_running = True
 
+    # Fresh simulated clock; controller, spawner & vehicle timing all read from it
+    sim_clock = SimClock(tick_rate=sim_tick_rate)
+
     # Reset ambulance timing
     last_ambulance_spawn_time = 0.0
 
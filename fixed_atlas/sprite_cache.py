@@ -0,0 +1,215 @@
+# Process-wide sprite cache: every image the simulator blits, packed into one atlas & shared by all spawns
+# (built once from the asset PNGs, then loaded from a raw binary cache file while the sources are unchanged)
+import os
+import sys
+import json
+import struct
+import pygame
+from . import settings
+
+# Raw atlas cache (rebuilt whenever a source image, the turn step or this format changes)
+atlas_cache_path = os.path.join(settings.base_path, "assets", "sprite_atlas.bin")
+atlas_cache_magic = b"SPRATLS1"
+
+# UI sprites stored pre-scaled
+ui_sprite_sizes = {"cursor": (45, 45), "sound_on": (26, 26), "sound_off": (26, 26)}
+
+# Sprite name -> ready-to-blit subsurface of the atlas
+_sprites = {}
+
+# (direction, vehicle class) -> {turn angle: rotated surface}
+_rotation_frames = {}
+
+# Atlas names of vehicle sprites
+def _vehicle_name(direction, vehicle_class):
+    return "vehicles/" + direction + "/" + vehicle_class
+
+def _turn_name(direction, vehicle_class, angle):
+    return _vehicle_name(direction, vehicle_class) + "@" + str(angle)
+
+# Source PNG of every sprite (turn frames are made from their vehicle's sprite)
+def _sprite_files():
+
+    asset_dir = os.path.join(settings.base_path, "assets")
+    files = {
+        "street_background": os.path.join(asset_dir, "street_background.png"),
+        "cursor": os.path.join(asset_dir, "cursor.png"),
+        "sound_on": os.path.join(asset_dir, "sound_on.png"),
+        "sound_off": os.path.join(asset_dir, "sound_off.png"),
+    }
+
+    for state in ("red", "yellow", "green"):
+        files["signals/" + state] = os.path.join(asset_dir, "signals", state + ".png")
+
+    for direction in settings.direction_numbers.values():
+        for vehicle_class in settings.speeds:
+            files[_vehicle_name(direction, vehicle_class)] = os.path.join(
+                asset_dir, "vehicles", direction, vehicle_class + ".png"
+            )
+
+    return files
+
+# What the cached atlas was built from: source mtimes & everything that shapes the variants
+def _atlas_key(files):
+    return {
+        "mtimes": {name: os.stat(path).st_mtime_ns for name, path in files.items()},
+        "rotation_angle": settings.rotation_angle,
+        "ui_sprite_sizes": {name: list(size) for name, size in ui_sprite_sizes.items()},
+    }
+
+# Decode every source image & derive the variants (scaled UI, tinted ambulances, turn frames)
+def _prepare_sprites(files):
+
+    sprites = {}
+    for name, path in files.items():
+        image = pygame.image.load(path)
+        if name in ui_sprite_sizes:
+            image = pygame.transform.scale(image, ui_sprite_sizes[name])
+        sprites[name] = image
+
+    for direction in settings.direction_numbers.values():
+        for vehicle_class in settings.speeds:
+            name = _vehicle_name(direction, vehicle_class)
+
+            # Make ambulances glow red
+            if vehicle_class == "ambulance":
+                sprites[name].fill((255, 0, 0, 120), special_flags=pygame.BLEND_RGBA_ADD)
+
+            for angle in range(settings.rotation_angle, 91, settings.rotation_angle):
+                sprites[_turn_name(direction, vehicle_class, angle)] = pygame.transform.rotate(sprites[name], -angle)
+
+    return sprites
+
+# Shelf packing, tallest first: name -> [x, y, w, h] & atlas size
+def _pack(sizes):
+
+    width = max(w for w, h in sizes.values())
+    rects = {}
+    x = y = shelf_height = 0
+
+    for name in sorted(sizes, key=lambda n: (-sizes[n][1], -sizes[n][0], n)):
+        w, h = sizes[name]
+        if x + w > width:
+            x = 0
+            y += shelf_height
+            shelf_height = 0
+        rects[name] = [x, y, w, h]
+        x += w
+        shelf_height = max(shelf_height, h)
+
+    return rects, (width, y + shelf_height)
+
+# Pack every sprite into one RGBA surface
+def build_atlas(files):
+
+    sprites = _prepare_sprites(files)
+    rects, size = _pack({name: image.get_size() for name, image in sprites.items()})
+
+    atlas = pygame.Surface(size, pygame.SRCALPHA, 32)
+    for name, image in sprites.items():
+        atlas.blit(image, rects[name][:2])
+
+    return atlas, rects
+
+# Cache file: magic, header length, JSON header (key, size, rects), raw RGBA pixels
+def _write_atlas_cache(atlas, rects, key):
+
+    header = json.dumps({"key": key, "size": list(atlas.get_size()), "rects": rects}).encode("utf-8")
+
+    # Written aside & swapped in, so parallel runs never read a half-written cache
+    tmp_path = atlas_cache_path + "." + str(os.getpid())
+    with open(tmp_path, "wb") as f:
+        f.write(atlas_cache_magic)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        f.write(pygame.image.tobytes(atlas, "RGBA"))
+    os.replace(tmp_path, atlas_cache_path)
+
+# Cached atlas & rects, or None when missing / built from other sources
+def _read_atlas_cache(key):
+
+    try:
+        with open(atlas_cache_path, "rb") as f:
+            if f.read(len(atlas_cache_magic)) != atlas_cache_magic:
+                return None
+            header_len = struct.unpack("<I", f.read(4))[0]
+            header = json.loads(f.read(header_len).decode("utf-8"))
+            if header["key"] != key:
+                return None
+
+            # Pixels read straight into the surface's buffer (no decode, no extra copy)
+            size = tuple(header["size"])
+            pixels = bytearray(size[0] * size[1] * 4)
+            if f.readinto(pixels) != len(pixels):
+                return None
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+
+    return pygame.image.frombuffer(pixels, size, "RGBA"), header["rects"]
+
+# Load the atlas (from the cache when it is current, else rebuilt & cached) & cut it into sprites
+def load_sprite_atlas():
+
+    files = _sprite_files()
+    key = _atlas_key(files)
+
+    cached = _read_atlas_cache(key)
+    if cached is None:
+        atlas, rects = build_atlas(files)
+        try:
+            _write_atlas_cache(atlas, rects, key)
+        except OSError as e:
+            print("[sprites] could not write atlas cache:", e)
+    else:
+        atlas, rects = cached
+
+    # Match the display pixel format when a window exists (fast blits)
+    if pygame.display.get_surface() is not None:
+        atlas = atlas.convert_alpha()
+
+    _sprites.clear()
+    _rotation_frames.clear()
+    for name, rect in rects.items():
+        _sprites[name] = atlas.subsurface(rect)
+
+    for direction in settings.direction_numbers.values():
+        for vehicle_class in settings.speeds:
+            _rotation_frames[(direction, vehicle_class)] = {
+                angle: _sprites[_turn_name(direction, vehicle_class, angle)]
+                for angle in range(settings.rotation_angle, 91, settings.rotation_angle)
+            }
+
+# Any packed sprite by name ("street_background", "cursor", "signals/red", "sound_on", ...)
+def get_sprite(name):
+
+    if not _sprites:
+        load_sprite_atlas()
+    return _sprites[name]
+
+# Shared sprite for a vehicle class travelling in a direction
+def get_vehicle_image(direction, vehicle_class):
+    return get_sprite(_vehicle_name(direction, vehicle_class))
+
+# Every frame of a turn (pre-rotated in the atlas)
+def get_rotation_frames(direction, vehicle_class):
+
+    if not _sprites:
+        load_sprite_atlas()
+    return _rotation_frames[(direction, vehicle_class)]
+
+# Turning sprite at a given angle (looked up, never rotated at run time)
+def get_rotated_image(direction, vehicle_class, angle):
+    return get_rotation_frames(direction, vehicle_class)[angle]
+
+# Load & convert every sprite once the display has been created (drops surfaces converted for a previous window)
+def preload_vehicle_images():
+    load_sprite_atlas()
+
+if __name__ == "__main__":
+
+    # Asset build step: rebuild the atlas cache from the source PNGs
+    pygame.init()
+    atlas, rects = build_atlas(_sprite_files())
+    _write_atlas_cache(atlas, rects, _atlas_key(_sprite_files()))
+    print("[sprites] packed", len(rects), "sprites into", atlas.get_size(), "->", atlas_cache_path)
+    sys.exit(0)
\ No newline at end of file
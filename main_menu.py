@@ -2,10 +2,65 @@
 import os
 import sys
 import math
+import time
+import argparse
 import pygame
-from fixed_atlas.fixed_atlas import main as run_fixed_sim
-from smart_atlas.smart_atlas import main as run_density_sim
-from atlas.atlas import main as run_atlas_sim
+from collections import OrderedDict
+
+# Launch time, for the startup budget check
+_launch_time = time.perf_counter()
+
+# Time allowed from launch to the first menu frame (seconds)
+startup_budget = 1.5
+
+# Modules that must not be loaded before a simulation is chosen (ATLAS vision stack)
+heavy_modules = ["torch", "ultralytics"]
+
+# Report time to the first menu frame & anything heavy that was imported on the way
+# (True when the menu came up within budget without heavy imports)
+def check_startup_budget():
+
+    elapsed = time.perf_counter() - _launch_time
+    print("[startup] first menu frame after {:.2f}s".format(elapsed))
+
+    if elapsed > startup_budget:
+        print("[startup] WARNING: over the {:.1f}s startup budget".format(startup_budget))
+
+    loaded = [name for name in heavy_modules if name in sys.modules]
+    if loaded:
+        print("[startup] WARNING: imported before a mode was chosen:", ", ".join(loaded))
+
+    return elapsed <= startup_budget and not loaded
+
+# Load & warm up the ATLAS model in the background once ATLAS is in focus (atlas settings: yolo_preload)
+def start_atlas_preload():
+
+    from atlas import settings as atlas_settings
+    if not atlas_settings.yolo_preload:
+        return
+
+    from atlas.yolo_intergation import preload_yolo
+    preload_yolo()
+
+# Rendered menu text kept for reuse (least recently used dropped first)
+text_cache_size = 64
+_text_cache = OrderedDict()
+
+# Cached font.render: same font (incl. bold), text & colour -> same surface, rasterized once
+def render_text(font, text, color):
+
+    key = (font, font.get_bold(), text, color)
+    surf = _text_cache.get(key)
+
+    if surf is None:
+        surf = font.render(text, True, color)
+        _text_cache[key] = surf
+        if len(_text_cache) > text_cache_size:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+
+    return surf
 
 # Button settings for UI
 def draw_button(
@@ -24,8 +79,8 @@ def draw_button(
     pygame.draw.rect(screen, color, rect, border_radius=10)
 
     # Render text surfaces
-    top_surf = top_font.render(top_text, True, (255, 255, 255))
-    bottom_surf = bottom_font.render(bottom_text, True, (240, 240, 240))
+    top_surf = render_text(top_font, top_text, (255, 255, 255))
+    bottom_surf = render_text(bottom_font, bottom_text, (240, 240, 240))
 
     # Button positions
     top_rect = top_surf.get_rect(center=(rect.centerx, rect.centery - 12))
@@ -38,16 +93,19 @@ def draw_button_quit(screen, rect, text, font, base_color, hover_color, mouse_po
     color = hover_color if rect.collidepoint(mouse_pos) else base_color
     pygame.draw.rect(screen, color, rect, border_radius=10)
 
-    text_surf = font.render(text, True, (255, 255, 255))
+    text_surf = render_text(font, text, (255, 255, 255))
     text_rect = text_surf.get_rect(center=rect.center)
     screen.blit(text_surf, text_rect)
 
-# Main menu function
-def main_menu():
+# Main menu function (check_startup: exit after the first frame, status 1 if the startup budget was missed)
+def main_menu(check_startup=False):
 
     # Centered window
     os.environ["SDL_VIDEO_CENTERED"] = "1"
 
+    first_frame = True
+    atlas_preload_allowed = True # off once another mode has run (that session never needed the model)
+
     while True:
 
         # Initialize PyGame
@@ -221,10 +279,12 @@ def main_menu():
             else:
                 hover_density = False
 
-            # Hover sound for ATLAS button
+            # Hover sound for ATLAS button (& start loading its model; never before the first menu frame)
             if atlas_button.collidepoint(mouse_pos):
                 if not hover_atlas:
                     hover_sound.play()
+                    if atlas_preload_allowed and not first_frame:
+                        start_atlas_preload()
                 hover_atlas = True
             else:
                 hover_atlas = False
@@ -269,13 +329,13 @@ def main_menu():
             screen.blit(background_img, (0, 0))
 
             # Title text
-            title_surf = title_font.render("Traffic Simulator", True, (0, 0, 0))
+            title_surf = render_text(title_font, "Traffic Simulator", (0, 0, 0))
             title_rect = title_surf.get_rect(center=(width // 2, 95))
             screen.blit(title_surf, title_rect)
 
             # Subtitle text
             subtitle_text = "Choose simulation mode:"
-            subtitle_surf = subtitle_font.render(subtitle_text, True, (0, 0, 0))
+            subtitle_surf = render_text(subtitle_font, subtitle_text, (0, 0, 0))
             subtitle_rect = subtitle_surf.get_rect(center=(width // 2, 170))
             screen.blit(subtitle_surf, subtitle_rect)
 
@@ -351,7 +411,7 @@ def main_menu():
 
             # Footer text
             footer_text = "Click a button to start or quit to exit"
-            footer_surf = subtitle_font.render(footer_text, True, (0, 0, 0))
+            footer_surf = render_text(subtitle_font, footer_text, (0, 0, 0))
             footer_rect = footer_surf.get_rect(center=(width // 2, height - 50))
             screen.blit(footer_surf, footer_rect)
 
@@ -368,7 +428,7 @@ def main_menu():
             label_text = "Music: OFF" if music_muted else "Music: ON"
             label_color = (200, 0, 0) if music_muted else (0, 120, 0)
 
-            label_surf = music_label_font.render(label_text, True, label_color)
+            label_surf = render_text(music_label_font, label_text, label_color)
             label_rect = label_surf.get_rect(
                 midleft=(mute_button.right + 8, mute_button.centery)
             )
@@ -381,18 +441,41 @@ def main_menu():
             pygame.display.flip()
             clock.tick(60)
 
+            if first_frame:
+                within_budget = check_startup_budget()
+                first_frame = False
+
+                if check_startup:
+                    pygame.quit()
+                    sys.exit(0 if within_budget else 1)
+
         pygame.quit()
 
-        # Launch chosen simulator
+        # Launch chosen simulator (imported only now; ATLAS pulls in torch & ultralytics when YOLO starts,
+        # or earlier through the background preload)
         if chosen_mode == "fixed":
+            atlas_preload_allowed = False
+            from fixed_atlas.fixed_atlas import main as run_fixed_sim
             run_fixed_sim()
         elif chosen_mode == "density":
+            atlas_preload_allowed = False
+            from smart_atlas.smart_atlas import main as run_density_sim
             run_density_sim()
         elif chosen_mode == "atlas":
+            from atlas.atlas import main as run_atlas_sim
             run_atlas_sim()
             # print("ATLAS Simulator")
         else:
             break # quit simulator
 
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+
+    parser = argparse.ArgumentParser(description="Traffic simulator launcher")
+    parser.add_argument(
+        "--check-startup",
+        action="store_true",
+        help="exit after the first menu frame, with status 1 if it missed the startup budget",
+    )
+    args = parser.parse_args()
+
+    main_menu(check_startup=args.check_startup)
\ No newline at end of file
@@ -0,0 +1,113 @@
+# Seeded, pre-sampled vehicle arrival schedules (same traffic for every controller)
+import functools
+import itertools
+import numpy as np
+from . import settings
+
+# Normal vehicle classes (ambulances are added by the cooldown rule)
+normal_classes = ["bike", "bus", "car", "rickshaw", "truck"]
+
+ambulance_chance = 0.05 # Chance that a spawn is an ambulance (when not cooling down)
+turn_chance = 0.5 # Chance that a lane 2 vehicle turns
+
+arrivals_per_chunk = 1000 # Arrivals sampled at a time (a run extends its schedule chunk by chunk)
+
+# Sample one chunk of an arrival schedule; the same arguments always give the same chunk
+# (chunk: index in the schedule, start_time & last_ambulance: carried over from the chunk before)
+@functools.lru_cache(maxsize=32)
+def generate_schedule(seed, count, spawn_interval, ambulance_cooldown, poisson=False,
+                      chunk=0, start_time=0.0, last_ambulance=-np.inf):
+
+    rng = np.random.default_rng([seed, chunk])
+
+    # Arrival times (first vehicle at 0s)
+    if poisson:
+        gaps = rng.exponential(spawn_interval, count)
+        if chunk == 0:
+            gaps[0] = 0.0
+        times = start_time + np.cumsum(gaps)
+    else:
+        times = (chunk * count + np.arange(count)) * spawn_interval
+
+    classes = np.array(normal_classes, dtype=object)[rng.integers(0, len(normal_classes), count)]
+    directions = rng.integers(0, 4, count)
+
+    # Ambulance candidates over every spawn (as the live spawner rolls before picking a class),
+    # then the cooldown between ambulances (only a handful to check)
+    ambulance_roll = rng.random(count) < ambulance_chance
+    for i in np.flatnonzero(ambulance_roll):
+        if times[i] - last_ambulance >= ambulance_cooldown:
+            classes[i] = "ambulance"
+            last_ambulance = times[i]
+
+    # Bikes only use lane 0, others (ambulances too) use lanes 1 or 2
+    lanes = np.where(classes == "bike", 0, rng.integers(1, 3, count))
+    will_turn = (lanes == 2) & (rng.random(count) < turn_chance)
+
+    schedule = {
+        "time": times,
+        "direction": directions,
+        "lane": lanes,
+        "vehicle_class": classes,
+        "will_turn": will_turn,
+    }
+
+    # Cached schedules are shared between runs
+    for column in schedule.values():
+        column.flags.writeable = False
+
+    return schedule
+
+# Endless schedule for the current settings, one chunk at a time (a run never runs out of arrivals,
+# however long it lasts)
+def schedule_for_run():
+
+    start_time = 0.0
+    last_ambulance = -np.inf
+
+    for chunk in itertools.count():
+        schedule = generate_schedule(
+            settings.arrival_seed,
+            arrivals_per_chunk,
+            settings.spawn_interval,
+            settings.ambulance_cooldown,
+            settings.poisson_arrivals,
+            chunk,
+            start_time,
+            last_ambulance,
+        )
+        yield schedule
+
+        start_time = float(schedule["time"][-1])
+        ambulance_times = schedule["time"][schedule["vehicle_class"] == "ambulance"]
+        if len(ambulance_times):
+            last_ambulance = float(ambulance_times[-1])
+
+# Spawner task that replays schedule chunks on the simulated clock
+def replay_schedule(chunks, spawn):
+
+    for schedule in chunks:
+        for time, dir_index, lane, vehicle_class, will_turn in zip(
+            schedule["time"],
+            schedule["direction"],
+            schedule["lane"],
+            schedule["vehicle_class"],
+            schedule["will_turn"],
+        ):
+            delay = time - settings.sim_clock.now
+            if delay > 0:
+                yield delay # Wait for the next arrival
+
+            if not settings.simulation_running:
+                return
+
+            if vehicle_class == "ambulance":
+                print("[SPAWN] Ambulance spotted!")
+
+            spawn(
+                int(lane),
+                vehicle_class,
+                int(dir_index),
+                settings.direction_numbers[int(dir_index)],
+                int(will_turn),
+            )
\ No newline at end of file
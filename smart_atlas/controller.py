@@ -1,10 +1,11 @@
 # Simulation logic & density functions
 import math
-import time
+import bisect
 import random
 from . import settings
 from .vehicle import Vehicle
 from .traffic_signal import TrafficSignal
+from .arrivals import schedule_for_run, replay_schedule
 
 # Initialize all traffic light signal objects
 def init_signals():
@@ -12,57 +13,66 @@ def init_signals():
     for _ in range(settings.no_of_signals):
         settings.signals.append(TrafficSignal())
 
-# Density calculation
+# Density calculation (from the running per-class counters, no lane scan)
 def compute_density(dir_index):
     
     direction = settings.direction_numbers[dir_index]
     score = 0.0
     
-    for lane in [0, 1, 2]:
-        for v in settings.vehicles[direction][lane]:
-            if v.crossed == 0:
-                score += settings.density_weights.get(v.vehicle_class, 1.0)
+    for vehicle_class, count in settings.waiting_by_class[direction].items():
+        if count:
+            score += count * settings.density_weights.get(vehicle_class, 1.0)
     return score
 
+# Number of vehicles that haven't crossed the stop line yet
+def count_waiting(dir_index):
+    return settings.waiting_count[settings.direction_numbers[dir_index]]
+
+# Front edge of a waiting vehicle, signed so it grows with distance behind the stop line
+_queue_keys = {
+    "right": lambda v: -(v.x + v.current_image.get_rect().width),
+    "down": lambda v: -(v.y + v.current_image.get_rect().height),
+    "left": lambda v: v.x,
+    "up": lambda v: v.y,
+}
+
+# Lane queue seen through its queue key, for bisect (bisect only takes key= from Python 3.10)
+# (keys are read on demand, so a search still looks at O(log n) vehicles)
+class _QueueKeys:
+
+    def __init__(self, queue, key):
+        self.queue = queue
+        self.key = key
+
+    def __len__(self):
+        return len(self.queue)
+
+    def __getitem__(self, index):
+        return self.key(self.queue[index])
+
+# Stop-line ROI (depth px into the lane, 10 px past the line) in queue-key space
+def roi_bounds(direction, roi_depth):
+
+    stop_line = settings.stop_lines[direction]
+
+    if direction in ("right", "down"):
+        return -(stop_line + 10), -(stop_line - roi_depth)
+    return stop_line - 10, stop_line + roi_depth
+
 # Scan all directions to determine where is the ambulance located
 def find_ambulance_dir():
 
     roi_depth = 1000 # px
 
+    # Only ambulances that haven't crossed are registered
     for dir_index in range(settings.no_of_signals):
         direction = settings.direction_numbers[dir_index]
+        low, high = roi_bounds(direction, roi_depth)
+        key = _queue_keys[direction]
 
-        for lane in [0, 1, 2]:
-            for v in settings.vehicles[direction][lane]:
-                # Only care about ambulances that haven't crossed
-                if v.crossed != 0 or v.vehicle_class != "ambulance":
-                    continue
-
-                rect = v.current_image.get_rect()
-
-                # East (moving right)
-                if direction == "right":
-                    right_edge = v.x + rect.width
-                    if settings.stop_lines["right"] - roi_depth <= right_edge <= settings.stop_lines["right"] + 10:
-                        return dir_index
-
-                # South (moving down)
-                elif direction == "down":
-                    bottom_edge = v.y + rect.height
-                    if settings.stop_lines["down"] - roi_depth <= bottom_edge <= settings.stop_lines["down"] + 10:
-                        return dir_index
-
-                # West (moving left)
-                elif direction == "left":
-                    left_edge = v.x
-                    if settings.stop_lines["left"] - 10 <= left_edge <= settings.stop_lines["left"] + roi_depth:
-                        return dir_index
-
-                # North (moving up)
-                elif direction == "up":
-                    top_edge = v.y
-                    if settings.stop_lines["up"] - 10 <= top_edge <= settings.stop_lines["up"] + roi_depth:
-                        return dir_index
+        for v in settings.active_ambulances:
+            if v.direction == direction and low <= key(v) <= high:
+                return dir_index
     return None
 
 # Count vehicles at stop line (ROI style)
@@ -72,36 +82,13 @@ def count_near_stop(dir_index):
     count = 0
     roi_depth = 250 # px
 
+    low, high = roi_bounds(direction, roi_depth)
+    key = _queue_keys[direction]
+
+    # Lane queues only hold waiting vehicles, already ordered by position
     for lane in [0, 1, 2]:
-        for v in settings.vehicles[direction][lane]:
-            if v.crossed != 0:
-                continue  # vehicles already passed junction
-
-            rect = v.current_image.get_rect()
-
-            # East (moving right)
-            if direction == "right":
-                right_edge = v.x + rect.width
-                if settings.stop_lines["right"] - roi_depth <= right_edge <= settings.stop_lines["right"] + 10:
-                    count += 1
-
-            # South (moving down)
-            elif direction == "down":
-                bottom_edge = v.y + rect.height
-                if settings.stop_lines["down"] - roi_depth <= bottom_edge <= settings.stop_lines["down"] + 10:
-                    count += 1
-
-            # West (moving left)
-            elif direction == "left":
-                left_edge = v.x
-                if settings.stop_lines["left"] - 10 <= left_edge <= settings.stop_lines["left"] + roi_depth:
-                    count += 1
-
-            # North (moving up)
-            elif direction == "up":
-                top_edge = v.y
-                if settings.stop_lines["up"] - 10 <= top_edge <= settings.stop_lines["up"] + roi_depth:
-                    count += 1
+        keys = _QueueKeys(settings.waiting_queues[direction][lane], key)
+        count += bisect.bisect_right(keys, high) - bisect.bisect_left(keys, low)
     return count
 
 # Use density to calculate the green light timer
@@ -184,7 +171,6 @@ def signal_controller():
                       "s, ending green early")
                 break
 
-            settings.time_elapsed += 1
             settings.signals[settings.current_green].signal_text = settings.signals[settings.current_green].green
             settings.signals[settings.current_green].green -= 1
             settings.signals[settings.current_green].total_green_time += 1
@@ -194,24 +180,23 @@ def signal_controller():
                 if i != settings.current_green:
                     settings.signals[i].signal_text = "---"
 
-            time.sleep(1)
+            yield 1
 
         settings.signals[settings.current_green].green = 0
 
         # Yellow light phase
         settings.current_yellow = 1
         while settings.signals[settings.current_green].yellow > 0:
-            settings.time_elapsed += 1
             settings.signals[settings.current_green].signal_text = settings.signals[settings.current_green].yellow
             settings.signals[settings.current_green].yellow -= 1
-            time.sleep(1)
+            yield 1
 
         settings.current_yellow = 0
         settings.signals[settings.current_green].signal_text = "stop"
 
         # Mark when the current lane finished its green + yellow
         finished_lane = settings.current_green
-        settings.lane_last_green_end[finished_lane] = settings.time_elapsed
+        settings.lane_last_green_end[finished_lane] = settings.sim_clock.now
 
         # Next lane choice (with ambulance priority)
         amb_dir = find_ambulance_dir()
@@ -226,7 +211,7 @@ def signal_controller():
         # Time taken for next lane to turn green light
         last_end = settings.lane_last_green_end[next_green]
         if last_end > 0:
-            wait_before_green = settings.time_elapsed - last_end
+            wait_before_green = settings.sim_clock.now - last_end
             settings.lane_wait_before_green_sum[next_green] += wait_before_green
             settings.lane_wait_before_green_count[next_green] += 1
 
@@ -239,9 +224,14 @@ def signal_controller():
 # Generate vehicles while simulation runs
 def generate_vehicles():
 
+    # Replay a seeded arrival schedule instead of live random spawns
+    if settings.arrival_seed is not None:
+        yield from replay_schedule(schedule_for_run(), spawn_vehicle)
+        return
+
     while settings.simulation_running:
 
-        now = time.time()
+        now = settings.sim_clock.now
         if not settings.simulation_running:
             return
 
@@ -284,7 +274,7 @@ def generate_vehicles():
             direction_number = 3
 
         # Vehicle object variables
-        Vehicle(
+        spawn_vehicle(
             lane_number,
             settings.vehicle_types[vehicle_type],
             direction_number,
@@ -297,4 +287,38 @@ def generate_vehicles():
             if not settings.simulation_running:
                 return
         
-        time.sleep(0.50) # Delay for every vehicle spawn
\ No newline at end of file
+        yield settings.spawn_interval # Delay for every vehicle spawn
+
+# Create a vehicle for the configured engine backend
+def spawn_vehicle(lane, vehicle_class, direction_number, direction, will_turn):
+
+    if settings.engine_backend == "numpy":
+        from .vector_engine import VehicleView
+        return VehicleView(lane, vehicle_class, direction_number, direction, will_turn)
+
+    return Vehicle(lane, vehicle_class, direction_number, direction, will_turn)
+
+# Move every vehicle one tick & retire the ones that left the map
+def move_vehicles():
+
+    if settings.engine_backend == "numpy":
+        from .vector_engine import get_store
+        get_store().step()
+        return
+
+    for v in settings.simulation.sprites():
+        v.move()
+        if v.has_left_map():
+            v.retire()
+
+# Start controller & spawner tasks on the simulated clock
+def start_simulation_tasks():
+
+    settings.sim_clock.schedule(signal_controller())
+    settings.sim_clock.schedule(generate_vehicles())
+
+# Advance the simulated clock by whole ticks (runs any due controller/spawner steps)
+def advance_clock(ticks=1):
+
+    settings.sim_clock.advance(ticks)
+    settings.time_elapsed = settings.sim_clock.now
\ No newline at end of file
@@ -12,32 +12,52 @@ def sec_to_min_sec(seconds):
     secs = int(seconds % 60)
     return "{:02d}:{:02d}".format(minutes, secs)
 
+# Raw run metrics (same values written to the excel sheet)
+def collect_stats():
+
+    # Direction order based on your settings
+    dirs = ["right", "down", "left", "up"]  # 0: right, 1: down, 2: left, 3: up
+    crossed = [settings.vehicles[d]["crossed"] for d in dirs]
+
+    return {
+        "time_elapsed": settings.time_elapsed,
+        "total_passed": sum(crossed),
+        "crossed": crossed,
+        "lane_wait_sum": list(settings.lane_wait_sum),
+        "lane_wait_count": list(settings.lane_wait_count),
+        "lane_wait_before_green_sum": list(settings.lane_wait_before_green_sum),
+        "lane_wait_before_green_count": list(settings.lane_wait_before_green_count),
+        "queue_at_green_sum": list(settings.queue_at_green_sum),
+        "queue_at_green_count": list(settings.queue_at_green_count),
+        "ambulance_priority_total": settings.ambulance_priority_total,
+        "ambulance_priority_per_lane": list(settings.ambulance_priority_per_lane),
+    }
+
 # Export stats function
 def export_stats_to_xlsx(filename="smart_stats.xlsx"):
     
     # Path to save excel file
     filepath = os.path.join(os.path.dirname(__file__), "results", filename)
 
-    # Direction order based on your settings
-    dirs = ["right", "down", "left", "up"]  # 0: right, 1: down, 2: left, 3: up
-    crossed = [settings.vehicles[d]["crossed"] for d in dirs]
+    stats = collect_stats()
+    crossed = stats["crossed"]
 
     # Raw sums & counts
-    lane_wait_sum = [sec_to_min_sec(v) for v in settings.lane_wait_sum]
-    lane_wait_count = settings.lane_wait_count
+    lane_wait_sum = [sec_to_min_sec(v) for v in stats["lane_wait_sum"]]
+    lane_wait_count = stats["lane_wait_count"]
 
-    lane_wait_before_green_sum = [sec_to_min_sec(v) for v in settings.lane_wait_before_green_sum]
-    lane_wait_before_green_count = settings.lane_wait_before_green_count
+    lane_wait_before_green_sum = [sec_to_min_sec(v) for v in stats["lane_wait_before_green_sum"]]
+    lane_wait_before_green_count = stats["lane_wait_before_green_count"]
 
-    queue_at_green_sum = [sec_to_min_sec(v) for v in settings.queue_at_green_sum]
-    queue_at_green_count = settings.queue_at_green_count
+    queue_at_green_sum = [sec_to_min_sec(v) for v in stats["queue_at_green_sum"]]
+    queue_at_green_count = stats["queue_at_green_count"]
 
-    total_passed = sum(crossed)
-    time_elapsed = sec_to_min_sec(settings.time_elapsed)
+    total_passed = stats["total_passed"]
+    time_elapsed = sec_to_min_sec(stats["time_elapsed"])
 
     # Ambulance priority stats
-    priority_total = settings.ambulance_priority_total
-    priority_lane = settings.ambulance_priority_per_lane
+    priority_total = stats["ambulance_priority_total"]
+    priority_lane = stats["ambulance_priority_per_lane"]
 
     # Create workbook & sheet
     wb = Workbook()
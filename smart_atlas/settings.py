@@ -1,6 +1,7 @@
 # Global constants & parameters
 import os
 import pygame
+from .sim_clock import SimClock
 
 # Base path of smart_atlas folder
 base_path = os.path.dirname(__file__)
@@ -49,6 +50,13 @@ base_time_per_weight = 1.5
 # Stop simulation when more than [amount of vehicles] have crossed
 vehicle_limit = 250
 
+# Seconds between vehicle spawns
+spawn_interval = 0.5
+
+# Replay a pre-sampled arrival schedule with this seed (None = live random spawns)
+arrival_seed = None
+poisson_arrivals = False # scheduled arrival times follow a Poisson process instead of a fixed interval
+
 # Ambulance spawn control
 last_ambulance_spawn_time = 0.0
 ambulance_cooldown = 60.0
@@ -100,6 +108,10 @@ x = {d: coords[:] for d, coords in base_x.items()}
 y = {d: coords[:] for d, coords in base_y.items()}
 stops = {d: coords[:] for d, coords in base_stops.items()}
 
+# Map size; vehicles that have crossed & driven past it are retired
+screen_width = 1400
+screen_height = 800
+
 # Intersection centre used for turns
 mid = {
     "right": {"x": 705, "y": 445},
@@ -121,6 +133,16 @@ vehicles = {
     "up": {0: [], 1: [], 2: [], "crossed": 0},
 }
 
+# Running counters of vehicles that haven't crossed yet (updated on spawn & stop-line crossing)
+waiting_by_class = {d: {c: 0 for c in speeds} for d in direction_numbers.values()} # per direction & class
+waiting_count = {d: 0 for d in direction_numbers.values()} # per direction
+
+# Waiting vehicles of each lane ordered front (nearest the stop line) to back, for ROI range lookups
+waiting_queues = {d: {0: [], 1: [], 2: []} for d in direction_numbers.values()}
+
+# Ambulances that haven't crossed yet (spawn order)
+active_ambulances = []
+
 # Signal light positions & ui counters
 signal_coords = [(530, 230), (810, 230), (810, 570), (530, 570)]
 signal_timer_coords = [(530, 210), (810, 210), (810, 550), (530, 550)]
@@ -131,6 +153,15 @@ current_green = 0 # which lane is green light currently
 current_yellow = 0 # 0 = green/red, 1 = yellow
 time_elapsed = 0 # simulator start timer
 sim_time = 300 # maximum simulation duration
+sim_tick_rate = 60 # simulated clock ticks per second (one tick per movement step)
+render_fps = 60 # display frame cap (the simulation keeps sim_tick_rate ticks per wall second while frames stay under max_frame_time)
+
+# Wall seconds one rendered frame may simulate at most (stops a slow machine spiralling into ever longer frames).
+# Anything a slower frame took beyond it is dropped, not simulated: below 1 / max_frame_time FPS (4 at 0.25 s),
+# or on a single stall such as a window drag, simulated time falls behind wall time. Runs match simulated-time
+# progress across frame rates only while every frame stays under this limit.
+max_frame_time = 0.25
+engine_backend = "objects" # vehicle movement: "objects" (Vehicle.move) or "numpy" (vector_engine)
 
 # Reset simulation function
 def reset_for_new_run():
@@ -140,8 +171,9 @@ def reset_for_new_run():
     global lane_wait_before_green_sum, lane_wait_before_green_count, lane_last_green_end
     global queue_at_green_sum, queue_at_green_count
     global vehicles, x, y, stops
+    global waiting_by_class, waiting_count, waiting_queues, active_ambulances
     global current_green, current_yellow, time_elapsed, simulation_running
-    global simulation
+    global simulation, sim_clock, vehicle_store
     global last_ambulance_spawn_time
     global ambulance_priority_total, ambulance_priority_per_lane
 
@@ -168,6 +200,10 @@ def reset_for_new_run():
         "left":  {0: [], 1: [], 2: [], "crossed": 0},
         "up":    {0: [], 1: [], 2: [], "crossed": 0},
     }
+    waiting_by_class = {d: {c: 0 for c in speeds} for d in direction_numbers.values()}
+    waiting_count = {d: 0 for d in direction_numbers.values()}
+    waiting_queues = {d: {0: [], 1: [], 2: []} for d in direction_numbers.values()}
+    active_ambulances = []
 
     # Reset spawn coordinates & stops to base values
     x = {d: coords[:] for d, coords in base_x.items()}
@@ -179,14 +215,20 @@ def reset_for_new_run():
     current_yellow = 0
     time_elapsed = 0
 
-    # Controls background threads and timers
+    # Controls controller & spawner tasks
     simulation_running = True
 
-    # Reset ambulance timing
-    last_ambulance_spawn_time = 0.0
+    # Fresh simulated clock; controller, spawner & vehicle timing all read from it
+    sim_clock = SimClock(tick_rate=sim_tick_rate)
+
+    # Reset ambulance timing (first ambulance may spawn straight away)
+    last_ambulance_spawn_time = -ambulance_cooldown
 
     # PyGame sprite group for vehicles
     simulation = pygame.sprite.Group()
 
+    # NumPy vehicle arrays (created on first spawn when engine_backend is "numpy")
+    vehicle_store = None
+
 # Initialise mutable state once at import
 reset_for_new_run()
\ No newline at end of file
@@ -2,6 +2,7 @@
 import tkinter as tk
 from . import settings
 from .export_stats import sec_to_min_sec
+from .controller import compute_density, count_near_stop, count_waiting
 
 # Global variables
 root = None
@@ -86,51 +87,13 @@ def start_stats_window():
             direction = settings.direction_numbers[i]
             passed = settings.vehicles[direction]["crossed"]
 
-            # Compute density
-            score = 0.0
-            for lane in [0, 1, 2]:
-                for v in settings.vehicles[direction][lane]:
-                    # Only count vehicles not yet crossed
-                    if v.crossed == 0:
-                        score += settings.density_weights.get(v.vehicle_class, 1.0)
-
-            # Count vehicles near stop line
-            roi_depth = 250 # px from the stop-line into the lane
-            count = 0
-
-            for lane in [0, 1, 2]:
-                for v in settings.vehicles[direction][lane]:
-                    if v.crossed != 0: # Ignore vehicles already passed the junction
-                        continue
-
-                    rect = v.current_image.get_rect()
-
-                    # Right (moving East)
-                    if direction == "right":
-                        right_edge = v.x + rect.width
-                        if settings.stop_lines["right"] - roi_depth <= right_edge <= settings.stop_lines["right"] + 10:
-                            count += 1
-
-                    # Down (moving South)
-                    elif direction == "down":
-                        bottom_edge = v.y + rect.height
-                        if settings.stop_lines["down"] - roi_depth <= bottom_edge <= settings.stop_lines["down"] + 10:
-                            count += 1
-
-                    # Left (moving West)
-                    elif direction == "left":
-                        left_edge = v.x
-                        if settings.stop_lines["left"] - 10 <= left_edge <= settings.stop_lines["left"] + roi_depth:
-                            count += 1
-
-                    # Up (moving North)
-                    elif direction == "up":
-                        top_edge = v.y
-                        if settings.stop_lines["up"] - 10 <= top_edge <= settings.stop_lines["up"] + roi_depth:
-                            count += 1
+            # Density from the running counters, queue from the stop-line ROI
+            score = compute_density(i)
+            count = count_near_stop(i)
+            waiting = count_waiting(i)
 
             # Build label text using old-style formatting
-            line_text = (dir_names[i] + ": dens=" + "%.2f" % score + " | queue=" + str(count) + " | passed=" + str(passed))
+            line_text = (dir_names[i] + ": dens=" + "%.2f" % score + " | queue=" + str(count) + " | waiting=" + str(waiting) + " | passed=" + str(passed))
 
             # Update lane label
             try:
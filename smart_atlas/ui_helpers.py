@@ -1,5 +1,26 @@
 # UI utilities
 import pygame
+from collections import OrderedDict
+
+# Rendered text surfaces kept for reuse (least recently used dropped first)
+text_cache_size = 256
+_text_cache = OrderedDict()
+
+# Cached font.render: same font (incl. bold), text & colours -> same surface, rasterized once
+def render_text(font, text, color, background=None):
+
+    key = (font, font.get_bold(), text, color, background)
+    surf = _text_cache.get(key)
+
+    if surf is None:
+        surf = font.render(text, True, color, background)
+        _text_cache[key] = surf
+        if len(_text_cache) > text_cache_size:
+            _text_cache.popitem(last=False)
+    else:
+        _text_cache.move_to_end(key)
+
+    return surf
 
 # Button functions
 def draw_small_button(screen, rect, text, font, base_color, hover_color, mouse_pos):
@@ -10,6 +31,8 @@ def draw_small_button(screen, rect, text, font, base_color, hover_color, mouse_p
         color = base_color
 
     pygame.draw.rect(screen, color, rect, border_radius=8)
-    text_surf = font.render(text, True, (255, 255, 255))
+    text_surf = render_text(font, text, (255, 255, 255))
     text_rect = text_surf.get_rect(center=rect.center)
-    screen.blit(text_surf, text_rect)
\ No newline at end of file
+    screen.blit(text_surf, text_rect)
+
+    return rect
\ No newline at end of file
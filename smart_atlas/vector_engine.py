@@ -0,0 +1,320 @@
+# NumPy structure-of-arrays vehicle store with a vectorized movement step
+# (Vehicle objects become thin views used for spawning, queries & rendering)
+import numpy as np
+from . import settings
+from .vehicle import Vehicle
+from .sprite_cache import get_vehicle_image, get_rotated_image, get_rotation_frames
+
+# Per-direction turn offsets applied every turning frame (same as Vehicle.move)
+# 0: right, 1: down, 2: left, 3: up
+_turn_dx = np.array([2.0, -2.5, -1.8, 1.0])
+_turn_dy = np.array([1.8, 2.0, -2.5, -1.0])
+
+# Unit travel vector of each direction (a turned vehicle drives along the next direction's road axis)
+_road_dx = np.array([1.0, 0.0, -1.0, 0.0])
+_road_dy = np.array([0.0, 1.0, 0.0, -1.0])
+
+# Sprite edge facing the direction of travel: x + w / y + h for right & down, x / y for left & up
+_horizontal = np.array([True, False, True, False])
+_rear_offset = np.array([0.0, 0.0, 1.0, 1.0]) # sprite lengths from the position to the back edge, along travel
+
+class VehicleStore:
+
+    def __init__(self, capacity=256):
+        self.size = 0 # Rows handed out so far (high-water mark)
+        self.free_rows = [] # Rows released by retired vehicles
+        self.spawned = 0 # Vehicles spawned so far (spawn order within a lane = driving order)
+        self.views = [] # Row -> VehicleView (None when free)
+
+        # Vehicle class name -> row in the frame size table
+        self.class_ids = {name: i for i, name in enumerate(settings.speeds)}
+        self._frame_w = np.zeros((len(self.class_ids), settings.no_of_signals, 91 // settings.rotation_angle + 1))
+        self._frame_h = np.zeros_like(self._frame_w)
+        self._frames_loaded = set()
+
+        # Per-direction stop lines & turning points (indexed by direction number)
+        names = [settings.direction_numbers[i] for i in range(settings.no_of_signals)]
+        # (all measured along the direction of travel, so one comparison works for every direction)
+        sign = _road_dx + _road_dy
+        self._stop_lines = sign * np.array([settings.stop_lines[name] for name in names], dtype=np.float64)
+        mid_x = np.array([settings.mid[name]["x"] for name in names], dtype=np.float64)
+        mid_y = np.array([settings.mid[name]["y"] for name in names], dtype=np.float64)
+        self._mids = np.where(_horizontal, mid_x, mid_y) * sign
+
+        self._alloc(capacity)
+
+    # (Re)allocate every column with a new capacity
+    def _alloc(self, capacity):
+        old_size = self.size
+
+        def grow(name, dtype, fill=0):
+            column = np.full(capacity, fill, dtype=dtype)
+            if hasattr(self, name):
+                column[:old_size] = getattr(self, name)[:old_size]
+            setattr(self, name, column)
+
+        grow("x", np.float64)
+        grow("y", np.float64)
+        grow("w", np.float64)
+        grow("h", np.float64)
+        grow("speed", np.float64)
+        grow("stop", np.float64)
+        grow("angle", np.int64)
+        grow("crossed", np.bool_)
+        grow("turned", np.bool_)
+        grow("will_turn", np.bool_)
+        grow("direction", np.int64)
+        grow("vehicle_class", np.int64)
+        grow("lane", np.int64)
+        grow("serial", np.int64)
+        grow("active", np.bool_)
+        self.capacity = capacity
+
+    # Fill the width/height table for every turn frame of a vehicle class
+    def _load_frame_sizes(self, dir_index, vehicle_class):
+        key = (dir_index, vehicle_class)
+        if key in self._frames_loaded:
+            return
+
+        direction = settings.direction_numbers[dir_index]
+        cls = self.class_ids[vehicle_class]
+        rect = get_vehicle_image(direction, vehicle_class).get_rect()
+        self._frame_w[cls, dir_index, 0] = rect.width
+        self._frame_h[cls, dir_index, 0] = rect.height
+
+        for angle, image in get_rotation_frames(direction, vehicle_class).items():
+            rect = image.get_rect()
+            self._frame_w[cls, dir_index, angle // settings.rotation_angle] = rect.width
+            self._frame_h[cls, dir_index, angle // settings.rotation_angle] = rect.height
+
+        self._frames_loaded.add(key)
+
+    # Hand out a row for a newly spawned vehicle
+    def allocate(self, view, dir_index, lane, vehicle_class, will_turn):
+        if self.free_rows:
+            row = self.free_rows.pop()
+        else:
+            if self.size == self.capacity:
+                self._alloc(self.capacity * 2)
+            row = self.size
+            self.size += 1
+            self.views.append(None)
+
+        self._load_frame_sizes(dir_index, vehicle_class)
+        cls = self.class_ids[vehicle_class]
+
+        self.views[row] = view
+        self.speed[row] = settings.speeds[vehicle_class]
+        self.direction[row] = dir_index
+        self.lane[row] = lane
+        self.serial[row] = self.spawned
+        self.spawned += 1
+        self.vehicle_class[row] = cls
+        self.will_turn[row] = bool(will_turn)
+        self.w[row] = self._frame_w[cls, dir_index, 0]
+        self.h[row] = self._frame_h[cls, dir_index, 0]
+        self.angle[row] = 0
+        self.crossed[row] = False
+        self.turned[row] = False
+        self.active[row] = True
+        return row
+
+    # Free a retired vehicle's row (its follower now follows the vehicle ahead of it)
+    def release(self, row):
+        self.active[row] = False
+        self.views[row] = None
+        self.free_rows.append(row)
+
+    # Advance every vehicle by one tick (same rules as Vehicle.move)
+    def step(self):
+        rows = np.flatnonzero(self.active[:self.size])
+        if len(rows) == 0:
+            return
+
+        # Live rows in driving order: by lane, then spawn order (each vehicle follows the one before it)
+        order = rows[np.lexsort((self.serial[rows], self.lane[rows], self.direction[rows]))]
+        count = len(order)
+        pos = np.arange(count)
+
+        x = self.x[order]
+        y = self.y[order]
+        w = self.w[order]
+        h = self.h[order]
+        speed = self.speed[order]
+        d = self.direction[order]
+        lane = self.lane[order]
+
+        lane_start = np.ones(count, dtype=bool)
+        lane_start[1:] = (d[1:] != d[:-1]) | (lane[1:] != lane[:-1])
+        first_in_lane = np.maximum.accumulate(np.where(lane_start, pos, 0))
+
+        # Positions along the direction of travel (front edge of each sprite)
+        ux = _road_dx[d]
+        uy = _road_dy[d]
+        horizontal = _horizontal[d]
+        rear = _rear_offset[d]
+        front = ux * x + uy * y + (1.0 - rear) * np.where(horizontal, w, h)
+
+        # Stop-line crossing (uses positions before the move)
+        crossing = front > self._stop_lines[d]
+        for row in order[~self.crossed[order] & crossing]:
+            self.views[row].mark_crossed()
+
+        crossed = self.crossed[order]
+        turned = self.turned[order]
+        stop = self.stop[order]
+        gap2 = settings.gap2
+
+        # Turning vehicles past the middle of the junction leave the approach phase
+        before_mid = front < self._mids[d]
+        approach = ~self.will_turn[order] | ~crossed | before_mid
+        turning = ~approach & ~turned
+        after_turn = ~approach & turned
+
+        # Turn animation does not depend on the leader
+        angle = self.angle[order] + np.where(turning, settings.rotation_angle, 0)
+        new_turned = turned | (turning & (angle == 90))
+        frame = angle // settings.rotation_angle
+        cls = self.vehicle_class[order]
+        new_w = self._frame_w[cls, d, frame]
+        new_h = self._frame_h[cls, d, frame]
+
+        # Allowed to pass the stop position (green, already crossed or not there yet)
+        stop_ok = front <= (ux + uy) * stop
+        stop_ok |= crossed | (d == settings.current_green)
+        may_approach = approach & stop_ok
+        any_after_turn = after_turn.any()
+
+        # Displacement if the row moves this tick: along its road before the turn, along the new road
+        # after it, or one turn frame (turning rows always move)
+        move_dx = np.where(
+            approach, speed * _road_dx[d], np.where(after_turn, speed * _road_dx[(d + 1) % 4], _turn_dx[d])
+        )
+        move_dy = np.where(
+            approach, speed * _road_dy[d], np.where(after_turn, speed * _road_dy[(d + 1) % 4], _turn_dy[d])
+        )
+
+        # Whether each row moves with its leader at (lx, ly); rows of lx/ly: leader still, leader moved
+        def moves_behind(has, lx, ly, lw, lh, lturned):
+            leader_back = ux * lx + uy * ly - rear * np.where(horizontal, lw, lh)
+            moves = turning | (may_approach & (~has | (front < leader_back - gap2) | lturned))
+
+            if any_after_turn:
+                clear_after_turn = np.choose(d, [
+                    (y + h < ly - gap2) | (x + w < lx - gap2),
+                    (x > lx + lw + gap2) | (y < ly - gap2),
+                    (y > ly + lh + gap2) | (x > lx + gap2),
+                    (x < lx - lw - gap2) | (y > ly + gap2),
+                ])
+                moves |= after_turn & (~has | clear_after_turn)
+
+            return moves
+
+        # Vehicles leaving the map this tick no longer hold back their follower, which then follows
+        # the vehicle ahead of them; repeat until that set is settled (rarely more than twice)
+        gone = np.zeros(count, dtype=bool)
+        while True:
+            # Leader of each row: the nearest vehicle ahead in its lane that stays on the map
+            ahead = np.maximum.accumulate(np.where(gone, -1, pos))
+            leader = np.full(count, -1)
+            leader[1:] = ahead[:-1]
+            has = leader >= first_in_lane
+            lead = np.where(has, leader, 0)
+
+            # Each row's move depends only on whether its leader moves
+            # (a leader that moves only ever widens the gap: moving with it still implies moving with it moved)
+            lx = x[lead]
+            ly = y[lead]
+            if_still, if_moved = moves_behind(
+                has,
+                np.stack([lx, lx + move_dx[lead]]),
+                np.stack([ly, ly + move_dy[lead]]),
+                new_w[lead],
+                new_h[lead],
+                new_turned[lead],
+            )
+
+            # One pass over each lane, front to back: a row that moves (or stays) whatever its leader does
+            # decides for every follower behind it that just does what its leader does
+            live = np.flatnonzero(~gone)
+            decided = (if_still[live] == if_moved[live]) | ~has[live]
+            last_decided = np.maximum.accumulate(np.where(decided, np.arange(len(live)), 0))
+            moves = np.zeros(count, dtype=bool)
+            moves[live] = if_still[live][last_decided]
+
+            # Rows leaving the map follow the nearest staying vehicle ahead too
+            leaving = np.flatnonzero(gone)
+            moves[leaving] = if_still[leaving] | (if_moved[leaving] & has[leaving] & moves[leader[leaving]])
+
+            new_x = x + np.where(moves, move_dx, 0.0)
+            new_y = y + np.where(moves, move_dy, 0.0)
+            next_gone = crossed & (
+                (new_x > settings.screen_width)
+                | (new_x + new_w < 0)
+                | (new_y > settings.screen_height)
+                | (new_y + new_h < 0)
+            )
+
+            if np.array_equal(next_gone, gone):
+                break
+            gone = next_gone
+
+        # Write back the new state
+        self.x[order] = new_x
+        self.y[order] = new_y
+        self.angle[order] = angle
+        self.turned[order] = new_turned
+        self.w[order] = new_w
+        self.h[order] = new_h
+
+        # Retire vehicles that have left the map
+        for row in np.sort(order[gone]):
+            self.views[row].retire()
+
+# Vehicle whose state lives in the store; spawning logic is shared with Vehicle
+class VehicleView(Vehicle):
+
+    def __init__(self, lane, vehicle_class, direction_number, direction, will_turn):
+        self._store = get_store()
+        self._row = self._store.allocate(self, direction_number, lane, vehicle_class, will_turn)
+        Vehicle.__init__(self, lane, vehicle_class, direction_number, direction, will_turn)
+
+    x = property(lambda self: float(self._store.x[self._row]),
+                 lambda self, value: self._store.x.__setitem__(self._row, value))
+    y = property(lambda self: float(self._store.y[self._row]),
+                 lambda self, value: self._store.y.__setitem__(self._row, value))
+    stop = property(lambda self: float(self._store.stop[self._row]),
+                    lambda self, value: self._store.stop.__setitem__(self._row, value))
+    crossed = property(lambda self: int(self._store.crossed[self._row]),
+                       lambda self, value: self._store.crossed.__setitem__(self._row, bool(value)))
+    turned = property(lambda self: int(self._store.turned[self._row]),
+                      lambda self, value: self._store.turned.__setitem__(self._row, bool(value)))
+    rotate_angle = property(lambda self: int(self._store.angle[self._row]),
+                            lambda self, value: self._store.angle.__setitem__(self._row, value))
+
+    # Sprite for the current turn angle (assignments are ignored; the angle decides)
+    @property
+    def current_image(self):
+        angle = self.rotate_angle
+        if angle == 0:
+            return get_vehicle_image(self.direction, self.vehicle_class)
+        return get_rotated_image(self.direction, self.vehicle_class, angle)
+
+    @current_image.setter
+    def current_image(self, value):
+        pass
+
+    # Movement happens in VehicleStore.step for every vehicle at once
+    def move(self):
+        pass
+
+    def retire(self):
+        Vehicle.retire(self)
+        self._store.release(self._row)
+
+# Store for the current run (created on first use after settings.reset_for_new_run)
+def get_store():
+
+    if settings.vehicle_store is None:
+        settings.vehicle_store = VehicleStore()
+    return settings.vehicle_store
\ No newline at end of file
@@ -1,8 +1,7 @@
 # Contains all the core vehicle logic (movement, spawning & turning)
-import os
-import time
 import pygame
 from . import settings
+from .sprite_cache import get_vehicle_image, get_rotated_image
 
 # Initialize PyGame sprite
 class Vehicle(pygame.sprite.Sprite):
@@ -25,21 +24,20 @@ class Vehicle(pygame.sprite.Sprite):
         self.rotate_angle = 0
 
         # Wait-time calculation
-        self.spawn_time = time.time()
+        self.spawn_time = settings.sim_clock.now
         settings.vehicles[direction][lane].append(self)
         self.index = len(settings.vehicles[direction][lane]) - 1
 
-        # Load images
-        path = os.path.join(settings.base_path, "assets", "vehicles", direction, vehicle_class + ".png")
-        self.original_image = pygame.image.load(path)
-        self.current_image = self.original_image
+        # Density counters & lane queue (a new vehicle is always waiting, behind the rest)
+        settings.waiting_by_class[direction][vehicle_class] += 1
+        settings.waiting_count[direction] += 1
+        settings.waiting_queues[direction][lane].append(self)
+        if vehicle_class == "ambulance":
+            settings.active_ambulances.append(self)
 
-        # Make ambulances glow red
-        if self.vehicle_class == "ambulance":
-            debug_surface = self.current_image.copy()
-            debug_surface.fill((255, 0, 0, 120), special_flags=pygame.BLEND_RGBA_ADD)
-            self.current_image = debug_surface
-            self.original_image = debug_surface
+        # Shared sprite from the cache (ambulances come pre-tinted)
+        self.original_image = get_vehicle_image(direction, vehicle_class)
+        self.current_image = self.original_image
 
         # Sprite API fields
         self.image = self.current_image
@@ -128,11 +126,46 @@ class Vehicle(pygame.sprite.Sprite):
 
         settings.simulation.add(self)
 
+    # True once the vehicle has crossed & driven completely off the map
+    def has_left_map(self):
+        if self.crossed == 0:
+            return False
+
+        rect = self.current_image.get_rect()
+        return (
+            self.x > settings.screen_width
+            or self.x + rect.width < 0
+            or self.y > settings.screen_height
+            or self.y + rect.height < 0
+        )
+
+    # Remove vehicle from its lane list & the sprite group
+    def retire(self):
+        lane_vehicles = settings.vehicles[self.direction][self.lane]
+        del lane_vehicles[self.index]
+
+        # Followers shift up one place so index - 1 still points at their leader
+        for v in lane_vehicles[self.index:]:
+            v.index -= 1
+
+        self.kill()
+
+    # Stop-line crossing bookkeeping (wait time, passed & density counters, lane queue)
+    def mark_crossed(self):
+        self.record_wait_time()
+        self.crossed = 1
+        settings.vehicles[self.direction]["crossed"] += 1
+        settings.waiting_by_class[self.direction][self.vehicle_class] -= 1
+        settings.waiting_count[self.direction] -= 1
+        settings.waiting_queues[self.direction][self.lane].remove(self)
+        if self.vehicle_class == "ambulance":
+            settings.active_ambulances.remove(self)
+
     # Record wait time when vehicles cross stop line
     def record_wait_time(self):
         if self.crossed == 0:
             idx = settings.direction_index[self.direction]
-            wait = time.time() - self.spawn_time
+            wait = settings.sim_clock.now - self.spawn_time
             settings.lane_wait_sum[idx] += wait
             settings.lane_wait_count[idx] += 1
     
@@ -144,9 +177,7 @@ class Vehicle(pygame.sprite.Sprite):
                 self.crossed == 0
                 and self.x + self.current_image.get_rect().width > settings.stop_lines[self.direction]
             ):
-                self.record_wait_time()
-                self.crossed = 1
-                settings.vehicles[self.direction]["crossed"] += 1
+                self.mark_crossed()
 
             if self.will_turn:
                 if (
@@ -168,8 +199,8 @@ class Vehicle(pygame.sprite.Sprite):
                 else:
                     if self.turned == 0:
                         self.rotate_angle += settings.rotation_angle
-                        self.current_image = pygame.transform.rotate(
-                            self.original_image, -self.rotate_angle
+                        self.current_image = get_rotated_image(
+                            self.direction, self.vehicle_class, self.rotate_angle
                         )
                         # Keep sprite image/rect in sync
                         self.image = self.current_image
@@ -214,9 +245,7 @@ class Vehicle(pygame.sprite.Sprite):
                 self.crossed == 0
                 and self.y + self.current_image.get_rect().height > settings.stop_lines[self.direction]
             ):
-                self.record_wait_time()
-                self.crossed = 1
-                settings.vehicles[self.direction]["crossed"] += 1
+                self.mark_crossed()
 
             if self.will_turn:
                 if (
@@ -242,8 +271,8 @@ class Vehicle(pygame.sprite.Sprite):
                 else:
                     if self.turned == 0:
                         self.rotate_angle += settings.rotation_angle
-                        self.current_image = pygame.transform.rotate(
-                            self.original_image, -self.rotate_angle
+                        self.current_image = get_rotated_image(
+                            self.direction, self.vehicle_class, self.rotate_angle
                         )
                         self.image = self.current_image
                         self.rect = self.current_image.get_rect(center=self.rect.center)
@@ -293,9 +322,7 @@ class Vehicle(pygame.sprite.Sprite):
         # Left (West)
         elif self.direction == "left":
             if self.crossed == 0 and self.x < settings.stop_lines[self.direction]:
-                self.record_wait_time()
-                self.crossed = 1
-                settings.vehicles[self.direction]["crossed"] += 1
+                self.mark_crossed()
 
             if self.will_turn:
                 if self.crossed == 0 or self.x > settings.mid[self.direction]["x"]:
@@ -321,8 +348,8 @@ class Vehicle(pygame.sprite.Sprite):
                 else:
                     if self.turned == 0:
                         self.rotate_angle += settings.rotation_angle
-                        self.current_image = pygame.transform.rotate(
-                            self.original_image, -self.rotate_angle
+                        self.current_image = get_rotated_image(
+                            self.direction, self.vehicle_class, self.rotate_angle
                         )
                         self.image = self.current_image
                         self.rect = self.current_image.get_rect(center=self.rect.center)
@@ -375,9 +402,7 @@ class Vehicle(pygame.sprite.Sprite):
         # Up (North)
         elif self.direction == "up":
             if self.crossed == 0 and self.y < settings.stop_lines[self.direction]:
-                self.record_wait_time()
-                self.crossed = 1
-                settings.vehicles[self.direction]["crossed"] += 1
+                self.mark_crossed()
 
             if self.will_turn:
                 if self.crossed == 0 or self.y > settings.mid[self.direction]["y"]:
@@ -403,8 +428,8 @@ class Vehicle(pygame.sprite.Sprite):
                 else:
                     if self.turned == 0:
                         self.rotate_angle += settings.rotation_angle
-                        self.current_image = pygame.transform.rotate(
-                            self.original_image, -self.rotate_angle
+                        self.current_image = get_rotated_image(
+                            self.direction, self.vehicle_class, self.rotate_angle
                         )
                         self.image = self.current_image
                         self.rect = self.current_image.get_rect(center=self.rect.center)
@@ -0,0 +1,164 @@
+# Parallel parameter sweep: fixed-time vs smart controller over a grid of settings (headless runs)
+import os
+import json
+import argparse
+import importlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.styles import Font
+
+# Simulator package for each controller mode
+mode_packages = {"fixed": "fixed_atlas", "smart": "smart_atlas"}
+
+# Settings each controller actually reads (others are not varied for that mode)
+mode_params = {
+    "fixed": ["vehicle_limit", "spawn_interval"],
+    "smart": [
+        "base_time_per_weight",
+        "default_minimum",
+        "default_maximum",
+        "density_weights",
+        "vehicle_limit",
+        "spawn_interval",
+    ],
+}
+
+# Default grid (every combination is run for every seed)
+# density_weights entries only override the listed vehicle classes; {} keeps the package weights
+default_grid = {
+    "base_time_per_weight": [1.0, 1.5, 2.0],
+    "default_minimum": [5, 10],
+    "default_maximum": [45, 60],
+    "density_weights": [{}],
+    "vehicle_limit": [250],
+    "spawn_interval": [0.5, 1.0, 1.5],
+}
+
+# Package settings before any sweep override (captured once per worker process)
+_defaults = {}
+
+# Every (mode, settings combination, seed) to run
+def build_jobs(grid, modes, seeds, max_time):
+
+    jobs = []
+    for mode in modes:
+        names = [name for name in mode_params[mode] if name in grid]
+        for values in itertools.product(*(grid[name] for name in names)):
+            params = dict(zip(names, values))
+            for seed in seeds:
+                jobs.append({"mode": mode, "params": params, "seed": seed, "max_time": max_time})
+    return jobs
+
+# Apply one combination on top of the package defaults
+def apply_params(settings, mode, params):
+
+    package = mode_packages[mode]
+    if package not in _defaults:
+        _defaults[package] = {name: getattr(settings, name) for name in mode_params[mode]}
+
+    for name, default in _defaults[package].items():
+        value = params.get(name)
+        if value is None:
+            value = default
+        elif name == "density_weights":
+            value = {**default, **value}
+        setattr(settings, name, value)
+
+# Run one headless simulation in a worker process & return its table row
+def run_job(job):
+
+    package = mode_packages[job["mode"]]
+    settings = importlib.import_module(package + ".settings")
+    headless = importlib.import_module(package + ".headless")
+
+    apply_params(settings, job["mode"], job["params"])
+    # Both controllers replay the same seeded arrival schedule
+    stats = headless.run_headless(seed=job["seed"], max_time=job["max_time"], arrival_seed=job["seed"])
+
+    row = {"mode": job["mode"], "seed": job["seed"]}
+    for name, value in job["params"].items():
+        row[name] = json.dumps(value, sort_keys=True) if isinstance(value, dict) else value
+
+    row["time_elapsed"] = stats["time_elapsed"]
+    row["total_passed"] = stats["total_passed"]
+    for direction, crossed in zip(["right", "down", "left", "up"], stats["crossed"]):
+        row["crossed_" + direction] = crossed
+
+    row["avg_wait"] = average(stats["lane_wait_sum"], stats["lane_wait_count"])
+    row["avg_wait_before_green"] = average(stats["lane_wait_before_green_sum"], stats["lane_wait_before_green_count"])
+    row["avg_queue_at_green"] = average(stats["queue_at_green_sum"], stats["queue_at_green_count"])
+    row["ambulance_priority_total"] = stats.get("ambulance_priority_total")
+    return row
+
+# Mean over all lanes (sum of sums / sum of counts)
+def average(sums, counts):
+
+    total = sum(counts)
+    if total == 0:
+        return None
+    return sum(sums) / total
+
+# Run all jobs across a process pool (results keep job order)
+def run_sweep(jobs, workers=None):
+
+    rows = [None] * len(jobs)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(run_job, job): i for i, job in enumerate(jobs)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            rows[futures[future]] = future.result()
+            print("[sweep] " + str(done) + "/" + str(len(jobs)) + " runs finished")
+
+    return rows
+
+# Write every run as one row of a single table
+def export_sweep_to_xlsx(rows, filepath):
+
+    # Run id, then every swept setting, then the metrics
+    columns = ["mode", "seed"]
+    for names in mode_params.values():
+        columns += [name for name in names if name not in columns and any(name in row for row in rows)]
+    for row in rows:
+        columns += [key for key in row if key not in columns]
+
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "Sweep"
+
+    for col, name in enumerate(columns, start=1):
+        ws.cell(row=1, column=col, value=name).font = Font(bold=True)
+
+    for row_idx, row in enumerate(rows, start=2):
+        for col, name in enumerate(columns, start=1):
+            ws.cell(row=row_idx, column=col, value=row.get(name))
+
+    # Header-based column widths
+    for col, name in enumerate(columns, start=1):
+        ws.column_dimensions[get_column_letter(col)].width = max(len(name), 10) + 2
+
+    ws.freeze_panes = "A2"
+    wb.save(filepath)
+    print("[sweep] results exported to", filepath)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Sweep fixed-time & smart controller settings with headless runs")
+    parser.add_argument("--grid", default=None, help="JSON file mapping setting name -> list of values")
+    parser.add_argument("--modes", nargs="+", choices=sorted(mode_packages), default=["fixed", "smart"])
+    parser.add_argument("--seeds", type=int, default=3, help="number of seeds per combination (1..N)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes")
+    parser.add_argument("--max-time", type=float, default=3600, help="simulated seconds cap per run")
+    parser.add_argument("--out", default="sweep_results.xlsx", help="output excel file")
+    args = parser.parse_args()
+
+    grid = dict(default_grid)
+    if args.grid:
+        with open(args.grid) as f:
+            grid.update(json.load(f))
+
+    jobs = build_jobs(grid, args.modes, range(1, args.seeds + 1), args.max_time)
+    print("[sweep] " + str(len(jobs)) + " runs on " + str(args.workers) + " workers")
+
+    export_sweep_to_xlsx(run_sweep(jobs, args.workers), args.out)
\ No newline at end of file
@@ -0,0 +1,51 @@
+# Seeded arrival schedules: same seed -> same arrivals, for as long as a run lasts
+import itertools
+import numpy as np
+import pytest
+from smart_atlas import arrivals, settings
+
+def _arrivals(seed, chunks, poisson=False):
+    arrivals.generate_schedule.cache_clear()
+    settings.arrival_seed = seed
+    settings.poisson_arrivals = poisson
+    try:
+        schedule = list(itertools.islice(arrivals.schedule_for_run(), chunks))
+    finally:
+        settings.arrival_seed = None
+        settings.poisson_arrivals = False
+    return {key: np.concatenate([chunk[key] for chunk in schedule]) for key in schedule[0]}
+
+@pytest.mark.parametrize("poisson", [False, True])
+def test_same_seed_gives_the_same_arrivals(poisson):
+    first = _arrivals(7, 3, poisson)
+    second = _arrivals(7, 3, poisson)
+    for key in first:
+        assert np.array_equal(first[key], second[key])
+
+    other = _arrivals(8, 3, poisson)
+    assert not np.array_equal(first["direction"], other["direction"])
+
+@pytest.mark.parametrize("poisson", [False, True])
+def test_schedule_extends_past_one_chunk(poisson):
+    schedule = _arrivals(1, 4, poisson)
+    times = schedule["time"]
+
+    assert len(times) == 4 * arrivals.arrivals_per_chunk
+    assert times[0] == 0.0
+    assert np.all(np.diff(times) >= 0.0)
+
+    # Ambulance cooldown holds across chunk boundaries too
+    ambulance_times = times[schedule["vehicle_class"] == "ambulance"]
+    assert np.all(np.diff(ambulance_times) >= settings.ambulance_cooldown)
+
+def test_fixed_interval_arrivals_cover_a_long_run():
+    times = _arrivals(1, 8)["time"]
+    assert np.allclose(np.diff(times), settings.spawn_interval)
+    assert times[-1] >= 3600.0
+
+def test_ambulances_rolled_over_every_spawn_like_the_live_spawner():
+    schedule = arrivals.generate_schedule(3, 100000, 0.5, 0.0)
+    is_ambulance = schedule["vehicle_class"] == "ambulance"
+
+    assert abs(is_ambulance.mean() - arrivals.ambulance_chance) < 0.005
+    assert np.all(schedule["lane"][is_ambulance] > 0)
\ No newline at end of file
@@ -0,0 +1,93 @@
+# DirtyRenderer: what gets repainted from the scenery & sent to the display each frame
+import os
+import pygame
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+from smart_atlas.dirty_render import DirtyRenderer
+
+grey = (90, 90, 90)
+red = (255, 0, 0)
+
+@pytest.fixture
+def screen():
+    pygame.display.init()
+    yield pygame.display.set_mode((200, 100))
+    pygame.display.quit()
+
+@pytest.fixture
+def updates(monkeypatch):
+    calls = []
+    monkeypatch.setattr(pygame.display, "update", lambda *args: calls.append(args))
+    return calls
+
+def _renderer(screen):
+    background = pygame.Surface(screen.get_size())
+    background.fill(grey)
+    return DirtyRenderer(screen, background)
+
+def test_first_frame_repaints_and_updates_everything(screen, updates):
+    screen.fill(red)
+    renderer = _renderer(screen)
+
+    renderer.restore()
+    renderer.update()
+
+    assert screen.get_at((150, 80))[:3] == grey
+    assert updates == [()]
+
+def test_later_frames_update_only_drawn_areas(screen, updates):
+    renderer = _renderer(screen)
+    renderer.restore()
+    renderer.update()
+
+    # Frame 2: something drawn at (10, 10)
+    renderer.restore()
+    drawn = renderer.mark(screen.fill(red, pygame.Rect(10, 10, 20, 20)))
+    renderer.update()
+    assert updates[-1] == ([drawn],)
+
+    # Frame 3: it moved to (50, 10); the old spot is repainted & sent too, so it gets erased
+    renderer.restore()
+    assert screen.get_at((15, 15))[:3] == grey
+    moved = renderer.mark(screen.fill(red, pygame.Rect(50, 10, 20, 20)))
+    renderer.update()
+    assert updates[-1] == ([drawn, moved],)
+
+def test_restore_leaves_unmarked_areas_alone(screen, updates):
+    renderer = _renderer(screen)
+    renderer.restore()
+    renderer.update()
+
+    renderer.restore()
+    renderer.mark(screen.fill(red, pygame.Rect(10, 10, 20, 20)))
+    screen.fill(red, pygame.Rect(120, 50, 20, 20)) # never marked
+    renderer.update()
+
+    renderer.restore()
+    assert screen.get_at((15, 15))[:3] == grey
+    assert screen.get_at((125, 55))[:3] == red
+
+def test_bake_and_mark_all_repaint_the_whole_screen(screen, updates):
+    renderer = _renderer(screen)
+    renderer.restore()
+    renderer.update()
+
+    # Baked scenery shows up on the next restore, which repaints & sends everything
+    stamp = pygame.Surface((10, 10))
+    stamp.fill(red)
+    renderer.bake(stamp, (180, 80))
+    renderer.restore()
+    renderer.update()
+    assert screen.get_at((185, 85))[:3] == red
+    assert updates[-1] == ()
+
+    # An overlay over the whole screen: sent whole this frame, repainted whole next frame
+    screen.fill(red)
+    renderer.mark_all()
+    renderer.update()
+    assert updates[-1] == ()
+
+    renderer.restore()
+    assert screen.get_at((5, 5))[:3] == grey
\ No newline at end of file
@@ -0,0 +1,23 @@
+# Startup budget: the menu's first frame comes up in time, without the ATLAS vision stack
+import os
+import sys
+import subprocess
+import main_menu
+
+repo_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_menu_starts_within_budget():
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", SDL_AUDIODRIVER="dummy")
+    result = subprocess.run(
+        [sys.executable, "main_menu.py", "--check-startup"],
+        cwd=repo_dir,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert result.returncode == 0, result.stdout + result.stderr
+
+def test_heavy_import_fails_the_check(monkeypatch):
+    monkeypatch.setitem(sys.modules, "torch", sys)
+    assert not main_menu.check_startup_budget()
\ No newline at end of file
@@ -0,0 +1,20 @@
+# NumPy movement backend: same run as the per-vehicle objects backend
+import pytest
+from smart_atlas import headless, settings
+
+def _run(backend, seed, max_time):
+    return headless.run_headless(seed=seed, max_time=max_time, backend=backend, arrival_seed=seed)
+
+@pytest.mark.parametrize("seed", [1, 2])
+def test_numpy_backend_matches_objects(seed):
+    assert _run("numpy", seed, 120) == _run("objects", seed, 120)
+
+def test_numpy_backend_matches_objects_in_dense_traffic(monkeypatch):
+    # Queues back up to the map edge & vehicles leave while others are still turning
+    monkeypatch.setattr(settings, "spawn_interval", 0.05)
+    assert _run("numpy", 3, 40) == _run("objects", 3, 40)
+
+def test_backend_applies_to_one_run_only():
+    configured = settings.engine_backend
+    _run("numpy", 1, 5)
+    assert settings.engine_backend == configured
\ No newline at end of file
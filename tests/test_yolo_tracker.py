@@ -0,0 +1,48 @@
+# BoxTracker: track continuity between detector runs & out-of-order runs
+import numpy as np
+from atlas.yolo_tracker import BoxTracker, max_misses
+
+def _boxes(*rows):
+    return np.array(rows, dtype=np.float64).reshape(-1, 4)
+
+def _cls(*ids):
+    return np.array(ids, dtype=int)
+
+def test_moving_boxes_keep_their_ids():
+    tracker = BoxTracker()
+    tracker.update(_boxes([100, 100, 140, 120], [300, 200, 320, 240]), _cls(3, 1), 0.0)
+    first_ids = tracker.ids.copy()
+
+    tracker.update(_boxes([300, 205, 320, 245], [105, 100, 145, 120]), _cls(1, 3), 0.1)
+
+    ids, boxes, cls_ids, _ = tracker.snapshot(0.1)
+    assert sorted(ids) == sorted(first_ids)
+    assert dict(zip(ids, cls_ids)) == dict(zip(first_ids, [3, 1]))
+    assert np.allclose(tracker.velocity[tracker.ids == first_ids[0]], [[50.0, 0.0]])
+    assert np.allclose(tracker.velocity[tracker.ids == first_ids[1]], [[0.0, 50.0]])
+
+def test_new_detection_starts_a_track_and_lost_tracks_expire():
+    tracker = BoxTracker()
+    tracker.update(_boxes([100, 100, 140, 120]), _cls(3), 0.0)
+    tracker.update(_boxes([100, 100, 140, 120], [600, 400, 640, 420]), _cls(3, 2), 0.1)
+    assert len(tracker.ids) == 2
+
+    # The second vehicle is gone: its track coasts for max_misses runs, then is dropped
+    for run in range(max_misses + 1):
+        tracker.update(_boxes([100, 100, 140, 120]), _cls(3), 0.2 + 0.1 * run)
+    assert list(tracker.ids) == [0]
+
+def test_older_run_after_a_newer_one_is_ignored():
+    tracker = BoxTracker()
+    tracker.update(_boxes([100, 100, 140, 120]), _cls(3), 0.0)
+    tracker.update(_boxes([105, 100, 145, 120]), _cls(3), 1.0)
+    velocity = tracker.velocity.copy()
+    boxes = tracker.boxes.copy()
+
+    # A frame captured at 0.5 s finishes after the 1.0 s run (or an empty gating update overtook it)
+    tracker.update(_boxes([102, 100, 142, 120]), _cls(3), 0.5)
+
+    assert np.array_equal(tracker.velocity, velocity)
+    assert np.array_equal(tracker.boxes, boxes)
+    assert np.all(tracker.last_seen == 1.0)
+    assert np.all(np.abs(tracker.velocity) < 100.0)
\ No newline at end of file